@@ -8,26 +8,51 @@ import os
 import sys
 import subprocess
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from colorama import Fore, Style, init
 
 # Initialize colorama
 init(autoreset=True)
 
-def run_command(cmd, description=None):
-    """Run a command with colorful output"""
+def print_command(cmd, description=None):
+    """Print the description and the command line being run"""
     if description:
         print(f"{Fore.CYAN}{Style.BRIGHT}🚀 {description}...{Style.RESET_ALL}")
     
     print(f"{Fore.YELLOW}$ {' '.join(cmd)}{Style.RESET_ALL}")
-    result = subprocess.run(cmd, capture_output=False)
-    
-    if result.returncode == 0:
+
+def print_result(returncode):
+    """Print whether a command succeeded and return True if it did"""
+    if returncode == 0:
         print(f"{Fore.GREEN}✓ Success!{Style.RESET_ALL}\n")
         return True
     else:
-        print(f"{Fore.RED}✗ Failed (code {result.returncode}){Style.RESET_ALL}\n")
+        print(f"{Fore.RED}✗ Failed (code {returncode}){Style.RESET_ALL}\n")
         return False
 
+def run_command(cmd, description=None):
+    """Run a command with colorful output"""
+    print_command(cmd, description)
+    result = subprocess.run(cmd, capture_output=False)
+    return print_result(result.returncode)
+
+def run_captured(cmd):
+    """Run a command, buffering its stdout and stderr so parallel runs don't interleave. colorama
+    strips the colours from output that isn't a terminal, so ask the child to keep them when ours is"""
+    env = dict(os.environ, TAREFAS_COLOR='1') if sys.stdout.isatty() else None
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, env=env)
+
+def run_parallel(category_cmds):
+    """Run every category at once, printing each one's output as it finishes"""
+    with ThreadPoolExecutor(max_workers=len(category_cmds)) as pool:
+        futures = {pool.submit(run_captured, cmd): category for category, cmd in category_cmds.items()}
+        for future in as_completed(futures):
+            category = futures[future]
+            result = future.result()
+            print_command(category_cmds[category], f"Processing {category.upper()} category")
+            print(result.stdout, end="")
+            yield category, print_result(result.returncode)
+
 def main():
     parser_args = [sys.executable, "tarefas.py"]
     categories = ["kitchen", "clothing", "cats"]
@@ -37,6 +62,7 @@ def main():
     parser.add_argument("--solver-only", action="store_true", help="Only run the solver, don't generate PDFs")
     parser.add_argument("--pdf-only", action="store_true", help="Only generate PDFs from existing JSON files")
     parser.add_argument("--start-date", type=str, help="Starting date in DD/MM/YYYY format (defaults to next Monday)")
+    parser.add_argument("--serial", action="store_true", help="Process categories one at a time with live output")
     args = parser.parse_args()
     
     # Default command arguments
@@ -55,12 +81,16 @@ def main():
     print(f"{Fore.GREEN}{Style.BRIGHT}🔄 RUNNING ALL TASK CATEGORIES 🔄{Style.RESET_ALL}")
     print(f"{Fore.MAGENTA}{'='*50}{Style.RESET_ALL}\n")
     
-    for category in categories:
-        # Build category-specific command
-        category_cmd = parser_args + ["-c", category] + cmd_args
-        desc = f"Processing {category.upper()} category"
-        success = run_command(category_cmd, desc)
-        
+    # Build category-specific commands
+    category_cmds = {category: parser_args + ["-c", category] + cmd_args for category in categories}
+    
+    if args.serial:
+        results = ((category, run_command(cmd, f"Processing {category.upper()} category"))
+                   for category, cmd in category_cmds.items())
+    else:
+        results = run_parallel(category_cmds)
+    
+    for category, success in results:
         if not success and not args.pdf_only:
             print(f"{Fore.YELLOW}Skipping PDF generation for {category} due to solver failure{Style.RESET_ALL}")
     
@@ -1,77 +1,174 @@
 #!/usr/bin/env python3
+import os
+import io
 import pulp
 import sys
 import json
+import contextlib
 import random
-from collections import defaultdict
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from itertools import combinations
 
+# orjson is optional, it only makes writing the schedule files faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from solution_cache import cache_path, load_cached, store_cached, schedule_from_json
+
 # CONFIGURATION
 PEOPLE = ["A", "C", "M", "P", "D", "H"]
 PAIRS = list(combinations(PEOPLE, 2))
+PERSON_INDEX = {p: i for i, p in enumerate(PEOPLE)}
+PERSON_RANGE = range(len(PEOPLE))
+PAIR_INDICES = [(PERSON_INDEX[p1], PERSON_INDEX[p2]) for p1, p2 in PAIRS]
+PAIR_LOOKUP = {pair: k for k, (p1, p2) in enumerate(PAIRS) for pair in ((p1, p2), (p2, p1))}
+
+def add_symmetry_breaking(prob, x, task_codes):
+    """Tasks (and people) are interchangeable in the model, so pin down one labeling of week 0:
+    the first person does the first task, and the remaining tasks are ordered by the ranks of
+    the people doing them. Any schedule can be relabeled to satisfy this. Swap two people so
+    someone doing the first task in week 0 comes first, then sort the other tasks by rank sum.
+    Their week-0 pairs are disjoint, so the sums never tie. Every row, including the pairing
+    bound (pair_max - pair_min ranges over all pairs), treats people and tasks alike. So the
+    relabeled schedule is just as fair, and the cut never removes the fairest schedule.
+    x is indexed as x[person index][task index][week]."""
+    first = x[0][0][0]
+    first.setInitialValue(1)
+    first.fixValue()
+    for t1 in range(1, len(task_codes) - 1):
+        prob += pulp.LpConstraint(pulp.LpAffineExpression([(x[i][t1][0], i) for i in PERSON_RANGE]
+                                                          + [(x[i][t1 + 1][0], -i) for i in PERSON_RANGE]),
+                                  sense=pulp.LpConstraintLE, rhs=0)
 
-def solve_rotation_schedule(task_codes, weeks, time_limit=30, max_allowed_diff=None):
+def solve_rotation_schedule(task_codes, weeks, time_limit=30, max_allowed_diff=None, initial_schedule=None,
+                            use_cache=True, fairest=False):
     """Solve for a fair rotation with two key constraints:
     1. Perfect pair rotation: everyone works with everyone else fairly
-    2. Perfect task rotation: everyone does each task fairly"""
+    2. Perfect task rotation: everyone does each task fairly
+    With max_allowed_diff the max-min pairing diff is bounded in the model, so the first feasible
+    schedule already meets it. With fairest=True that diff is minimized instead, and if
+    initial_schedule is given (e.g. a solution for fewer weeks), it is repeated to cover every
+    week and handed to CBC as a MIP start. Solutions are cached in CACHE_DIR unless use_cache
+    is False."""
     print(f"Solving for {len(task_codes)} tasks over {weeks} weeks...")
+    cached_at = cache_path("pulp-fairest" if fairest else "pulp", sorted(task_codes), weeks, max_allowed_diff)
+    cached = load_cached(cached_at) if use_cache else None
+    if cached is not None:
+        print(f"Solution status: Optimal (cached in {cached_at})")
+        return schedule_from_json(cached)
     
-    # Setup variables: x[person][task][week] = 1 if person is assigned to task in week
-    x = pulp.LpVariable.dicts('x', (PEOPLE, task_codes, range(weeks)), 0, 1, pulp.LpBinary)
-    y = pulp.LpVariable.dicts('y', (PEOPLE, PEOPLE, range(weeks)), 0, 1, pulp.LpBinary)
+    # Setup variables, indexed by small ints rather than names: x[i][ti][w] = 1 if PEOPLE[i]
+    # is assigned to task_codes[ti] in week w, and y[k][w] = 1 if the pair PAIRS[k] works together
+    task_range = range(len(task_codes))
+    week_range = range(weeks)
+    x = [[[pulp.LpVariable(f"x_{p}_{t}_{w}", 0, 1, pulp.LpBinary) for w in week_range]
+          for t in task_codes] for p in PEOPLE]
+    x_flat = [(PEOPLE[i], task_codes[ti], w, x[i][ti][w]) for i in PERSON_RANGE for ti in task_range for w in week_range]
+    y = [[pulp.LpVariable(f"y_{p1}_{p2}_{w}", 0, 1, pulp.LpBinary) for w in week_range] for (p1, p2) in PAIRS]
     prob = pulp.LpProblem('TaskRotation', pulp.LpMinimize)
     prob += 0  # Dummy objective
 
-    # Each person does at most one task per week
-    for p in PEOPLE:
-        for w in range(weeks):
-            prob += pulp.lpSum(x[p][t][w] for t in task_codes) <= 1
+    # Each person does at most one task per week, also declared as an SOS1 set so CBC
+    # branches on the whole set instead of one variable at a time
+    x_week = [[pulp.LpAffineExpression([(x[i][ti][w], 1) for ti in task_range]) for w in week_range]
+              for i in PERSON_RANGE]
+    for i, p in enumerate(PEOPLE):
+        for w in week_range:
+            prob += pulp.LpConstraint(x_week[i][w], sense=pulp.LpConstraintLE, rhs=1)
+            prob.sos1[f"one_task_{p}_{w}"] = {x[i][ti][w]: ti + 1 for ti in task_range}
 
     # Each task gets exactly 2 people per week
-    for t in task_codes:
-        for w in range(weeks):
-            prob += pulp.lpSum(x[p][t][w] for p in PEOPLE) == 2
+    for ti in task_range:
+        for w in week_range:
+            prob += pulp.LpConstraint(pulp.LpAffineExpression([(x[i][ti][w], 1) for i in PERSON_RANGE]),
+                                      sense=pulp.LpConstraintEQ, rhs=2)
 
-    # Link y[p1][p2][w] = 1 if p1 and p2 work together in week w
-    for w in range(weeks):
-        for t in task_codes:
-            for p1 in PEOPLE:
-                for p2 in PEOPLE:
-                    if p1 >= p2:
-                        continue
-                    # If both p1 and p2 are assigned to task t in week w, y[p1][p2][w] = 1
-                    prob += y[p1][p2][w] >= x[p1][t][w] + x[p2][t][w] - 1
+    # Link y[k][w] = 1 if the two people of PAIRS[k] work together in week w
+    for w in week_range:
+        for ti in task_range:
+            for k, (i1, i2) in enumerate(PAIR_INDICES):
+                # If both people are assigned to task ti in week w, y[k][w] = 1
+                prob += pulp.LpConstraint(pulp.LpAffineExpression([(y[k][w], 1), (x[i1][ti][w], -1), (x[i2][ti][w], -1)]),
+                                          sense=pulp.LpConstraintGE, rhs=-1)
         
         # y can only be 1 if both people are assigned to a task
-        for p1 in PEOPLE:
-            for p2 in PEOPLE:
-                if p1 >= p2:
-                    continue
-                prob += y[p1][p2][w] <= pulp.lpSum(x[p1][t][w] for t in task_codes)
-                prob += y[p1][p2][w] <= pulp.lpSum(x[p2][t][w] for t in task_codes)
+        for k, (i1, i2) in enumerate(PAIR_INDICES):
+            prob += y[k][w] <= x_week[i1][w]
+            prob += y[k][w] <= x_week[i2][w]
 
     # Perfect task rotation: in every block of len(task_codes) weeks, each person does each task exactly once
     task_block = len(task_codes)
-    for p in PEOPLE:
+    for i in PERSON_RANGE:
         for block_start in range(0, weeks, task_block):
-            block_weeks = [w for w in range(block_start, min(block_start + task_block, weeks))]
-            for t in task_codes:
-                prob += pulp.lpSum(x[p][t][w] for w in block_weeks) == 1
+            block_weeks = range(block_start, min(block_start + task_block, weeks))
+            for ti in task_range:
+                prob += pulp.LpConstraint(pulp.LpAffineExpression([(x[i][ti][w], 1) for w in block_weeks]),
+                                          sense=pulp.LpConstraintEQ, rhs=1)
+
+    # Fairness is part of the model when it is minimized (fairest) or bounded (max_allowed_diff),
+    # otherwise the first schedule CBC finds is only checked afterwards
+    fair_model = fairest or max_allowed_diff is not None
 
     # Try to ensure fair distribution of partners: everyone works with everyone fairly
     block_size = len(PEOPLE) - 1
-    for p1 in PEOPLE:
-        for block_start in range(0, weeks, block_size):
-            block_weeks = [w for w in range(block_start, min(block_start + block_size, weeks))]
-            for p2 in PEOPLE:
-                if p1 == p2:
-                    continue
-                prob += pulp.lpSum(y[min(p1,p2)][max(p1,p2)][w] for w in block_weeks) >= 1
-                prob += pulp.lpSum(y[min(p1,p2)][max(p1,p2)][w] for w in block_weeks) <= 2
-
-    # Solve the model
+    for block_start in range(0, weeks, block_size):
+        block_weeks = range(block_start, min(block_start + block_size, weeks))
+        for k in range(len(PAIRS)):
+            together = pulp.LpAffineExpression([(y[k][w], 1) for w in block_weeks])
+            if not fair_model:
+                prob += pulp.LpConstraint(together, sense=pulp.LpConstraintGE, rhs=1)
+            prob += pulp.LpConstraint(together, sense=pulp.LpConstraintLE, rhs=2)
+
+    if fair_model:
+        # The linking rows only bound y from below, so pin it down exactly: if p1 does task ti and
+        # p2 doesn't, they are not together. With exact y the per-block minimum above can't hold
+        # (a short last block has fewer meetings than pairs), so it is left out and fairness
+        # comes from pair_max - pair_min over the totals instead, minimized or bounded.
+        for w in week_range:
+            for ti in task_range:
+                for k, (i1, i2) in enumerate(PAIR_INDICES):
+                    prob += pulp.LpConstraint(pulp.LpAffineExpression([(y[k][w], 1), (x[i1][ti][w], 1), (x[i2][ti][w], -1)]),
+                                              sense=pulp.LpConstraintLE, rhs=1)
+        pair_max = pulp.LpVariable("pair_max", 0, cat=pulp.LpInteger)
+        pair_min = pulp.LpVariable("pair_min", 0, cat=pulp.LpInteger)
+        for k in range(len(PAIRS)):
+            pair_total = pulp.LpAffineExpression([(y[k][w], 1) for w in week_range])
+            prob += pair_max >= pair_total
+            prob += pair_min <= pair_total
+        # Every week puts one pair on each task, so the average pair total sits between them
+        meetings = len(task_codes) * weeks
+        prob += pair_min <= meetings // len(PAIRS)
+        prob += pair_max >= -(-meetings // len(PAIRS))
+        if fairest:
+            prob.setObjective(pair_max - pair_min)
+        else:
+            prob += pair_max - pair_min <= max_allowed_diff
+
+    add_symmetry_breaking(prob, x, task_codes)
+
+    # Warm start from a previous schedule, padding the extra weeks by repeating it. Only a solve with
+    # a real objective can improve on it; any other solve would just hand the start back
+    warm_start = bool(initial_schedule) and fairest
+    if warm_start:
+        for p, t, w, var in x_flat:
+            var.setInitialValue(1 if p in initial_schedule[w % len(initial_schedule)].get(t, ()) else 0)
+
+    # Solve the model. With the dummy objective any feasible schedule will do, and the fairness
+    # bound (if any) is in the model: accept any gap and stop at the first integer solution
+    # instead of exploring the rest of the tree. Which schedule comes first depends on the order
+    # of rows and columns, so anything the result has to satisfy must be a constraint
     print(f"Solving with {time_limit} second time limit...")
-    solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit)
+    if fairest:
+        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, threads=os.cpu_count(),
+                                   warmStart=warm_start, gapRel=0)
+    else:
+        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, threads=os.cpu_count(),
+                                   gapRel=1, options=["allowableGap 1e9", "maxSolutions 1"])
     prob.solve(solver)
     status = pulp.LpStatus[prob.status]
     print(f"Solution status: {status}")
@@ -80,14 +177,7 @@ def solve_rotation_schedule(task_codes, weeks, time_limit=30, max_allowed_diff=N
         return None
         
     # Extract the solution
-    schedule = []
-    for w in range(weeks):
-        week_assignments = {}
-        for t in task_codes:
-            assigned = [p for p in PEOPLE if pulp.value(x[p][t][w]) > 0.5]
-            if len(assigned) == 2:
-                week_assignments[t] = tuple(assigned)
-        schedule.append(week_assignments)
+    schedule = extract_schedule(x_flat, task_codes, weeks)
     
     # Check fairness of pairing distribution
     min_pair, max_pair, _ = get_pairing_stats(schedule)
@@ -98,112 +188,341 @@ def solve_rotation_schedule(task_codes, weeks, time_limit=30, max_allowed_diff=N
         print(f"[ERROR] Output solution violates max-min diff constraint!")
         return None
         
+    if use_cache:
+        store_cached(cached_at, schedule)
+    return schedule
+
+def extract_schedule(x_flat, task_codes, weeks):
+    """Build the schedule from x_flat, which holds (person, task, week, variable) tuples in
+    creation order (person by person, task by task, week by week). Each varValue is read once
+    into a flat mask, and positions in that layout give the people on each (task, week)."""
+    chosen = [var.varValue is not None and var.varValue > 0.5 for _, _, _, var in x_flat]
+    stride = len(task_codes) * weeks
+    schedule = []
+    for w in range(weeks):
+        week_assignments = {}
+        for ti, t in enumerate(task_codes):
+            offset = ti * weeks + w
+            assigned = [p for i, p in enumerate(PEOPLE) if chosen[i * stride + offset]]
+            if len(assigned) == 2:
+                week_assignments[t] = tuple(assigned)
+        schedule.append(week_assignments)
+    return schedule
+
+def _week_options(n_tasks):
+    """List every way to staff one week: a tuple of disjoint PAIRS indices, one per task"""
+    options = []
+
+    def extend(chosen, used):
+        if len(chosen) == n_tasks:
+            options.append(tuple(chosen))
+            return
+        for k, (i1, i2) in enumerate(PAIR_INDICES):
+            if not (used >> i1) & 1 and not (used >> i2) & 1:
+                extend(chosen + [k], used | (1 << i1) | (1 << i2))
+
+    extend([], 0)
+    return options
+
+def solve_with_backtracking(task_codes, weeks, time_limit=30, max_allowed_diff=None, use_cache=True):
+    """Search week by week for the same rotation the ILP describes:
+    1. Perfect task rotation: every block of len(task_codes) weeks, each person does each task once
+    2. Pair rotation: no pair works together more than twice in a block of len(PEOPLE) - 1 weeks
+    When max_allowed_diff is given, the max-min pairing diff is used to prune the search too.
+    Solutions are cached in CACHE_DIR unless use_cache is False."""
+    print(f"Searching for {len(task_codes)} tasks over {weeks} weeks...")
+    cached_at = cache_path("backtracking", sorted(task_codes), weeks, max_allowed_diff)
+    cached = load_cached(cached_at) if use_cache else None
+    if cached is not None:
+        print(f"Solution status: Optimal (cached in {cached_at})")
+        return schedule_from_json(cached)
+    n_tasks = len(task_codes)
+    options = _week_options(n_tasks)
+
+    # Every person does every task once per block, so everyone has to work every week
+    # and a trailing partial block can never be completed
+    if not options or len(PEOPLE) != 2 * n_tasks or weeks % n_tasks != 0:
+        print("Solution status: Infeasible")
+        return None
+
+    task_block = n_tasks
+    pair_block = len(PEOPLE) - 1
+    pair_block_cap = 2
+    # Bit i * n_tasks + t of an option's task signature is set when person i does task t
+    task_sig = {o: sum((1 << (i * n_tasks + t)) for t, k in enumerate(o) for i in PAIR_INDICES[k]) for o in options}
+    pair_sig = {o: sum(1 << k for k in o) for o in options}
+
+    # weeks * n_tasks pairings get shared among PAIRS, which bounds every pair's final count
+    total_pairings = weeks * n_tasks
+    pair_cap = weeks
+    if max_allowed_diff is not None:
+        pair_cap = total_pairings // len(PAIRS) + max_allowed_diff
+        ceiling_avg = -(-total_pairings // len(PAIRS))
+
+    pair_total = [0] * len(PAIRS)
+    pair_block_count = [0] * len(PAIRS)
+    chosen = []
+    dead_ends = set()   # fully explored search states that cannot be completed
+    deadline = time.monotonic() + time_limit
+    nodes = 0
+    timed_out = False
+
+    def fair_enough(remaining):
+        # Each pair can gain at most one pairing per week and n_tasks pairings are handed out weekly
+        needed = max(max(pair_total), ceiling_avg) - max_allowed_diff
+        deficit = 0
+        for count in pair_total:
+            if count < needed:
+                if needed - count > remaining:
+                    return False
+                deficit += needed - count
+        return deficit <= remaining * n_tasks
+
+    def search(w, done, blocked, order, budget):
+        # done: task signature bits already used in this task block
+        # blocked: pairs that hit their per-block or overall cap
+        nonlocal nodes, timed_out, pair_block_count
+        if w == weeks:
+            return True
+        nodes += 1
+        if nodes % 1024 == 0 and time.monotonic() > deadline:
+            timed_out = True
+        if timed_out or nodes > budget:
+            return False
+
+        state = None
+        saved_counts = None
+        if w % task_block == 0:
+            # Whatever happened inside earlier task blocks, only these counts matter from here on
+            state = (w, tuple(pair_total), tuple(pair_block_count) if w % pair_block else ())
+            if state in dead_ends:
+                return False
+            done = 0
+        if w % pair_block == 0:
+            saved_counts, pair_block_count = pair_block_count, [0] * len(PAIRS)
+            blocked = sum(1 << k for k, count in enumerate(pair_total) if count >= pair_cap)
+
+        candidates = [o for o in order if not (task_sig[o] & done or pair_sig[o] & blocked)]
+        # Try the least used pairs first so balanced schedules are found early
+        candidates.sort(key=lambda o: sum(pair_total[k] for k in o))
+        found = False
+        for option in candidates:
+            child_blocked = blocked
+            for k in option:
+                pair_block_count[k] += 1
+                pair_total[k] += 1
+                if pair_block_count[k] >= pair_block_cap or pair_total[k] >= pair_cap:
+                    child_blocked |= 1 << k
+            chosen.append(option)
+            found = ((max_allowed_diff is None or fair_enough(weeks - w - 1))
+                     and search(w + 1, done | task_sig[option], child_blocked, order, budget))
+            if found:
+                break
+            chosen.pop()
+            for k in option:
+                pair_block_count[k] -= 1
+                pair_total[k] -= 1
+
+        if saved_counts is not None:
+            pair_block_count = saved_counts
+        if state is not None and not found and not timed_out and nodes <= budget:
+            dead_ends.add(state)
+        return found
+
+    # A bad early week can trap a depth-first search for a long time, so restart with a
+    # shuffled tie-break order and a doubled node budget until the time limit runs out
+    found = False
+    exhausted = False
+    attempt = 0
+    while not (found or exhausted or timed_out):
+        order = list(options)
+        random.Random(attempt).shuffle(order)
+        budget = nodes + 256 * 2 ** attempt
+        found = search(0, 0, 0, order, budget)
+        exhausted = not found and not timed_out and nodes <= budget
+        attempt += 1
+
+    status = 'Optimal' if found else ('Infeasible' if exhausted else 'Not Solved')
+    print(f"Solution status: {status} ({nodes} nodes, {attempt} restarts)")
+    if not found:
+        return None
+
+    schedule = [{t: PAIRS[k] for t, k in zip(task_codes, option)} for option in chosen]
+    min_pair, max_pair, _ = get_pairing_stats(schedule)
+    print(f"Pairing distribution - min: {min_pair}, max: {max_pair}, diff: {max_pair - min_pair}")
+    if use_cache:
+        store_cached(cached_at, schedule)
     return schedule
 
 def get_pairing_stats(schedule):
-    """Calculate statistics about partner pairings"""
-    pair_counts = defaultdict(int)
+    """Calculate statistics about partner pairings (pairs that never meet count as 0)"""
+    counts = [0] * len(PAIRS)
     for week in schedule:
-        for task, pair in week.items():
-            p1, p2 = sorted(pair)
-            pair_counts[(p1, p2)] += 1
-    counts = list(pair_counts.values())
-    return min(counts), max(counts), pair_counts
+        for pair in week.values():
+            counts[PAIR_LOOKUP[pair]] += 1
+    return min(counts), max(counts), dict(zip(PAIRS, counts))
+
+def _emit_lp(task_codes, weeks, seed):
+    """Write the randomized model straight to CPLEX LP text, without building PuLP objects.
+    Variables are named x_<person>_<task>_<week> and y_<p1>_<p2>_<week>."""
+    out = io.StringIO()
+    write = out.write
+    week_range = range(weeks)
+    xn = {(p, t, w): f"x_{p}_{t}_{w}" for p in PEOPLE for t in task_codes for w in week_range}
+    yn = {(p1, p2, w): f"y_{p1}_{p2}_{w}" for (p1, p2) in PAIRS for w in week_range}
+    write(f"\\* TaskRotation_{seed} *\\\nMinimize\nobj: 0 {xn[(PEOPLE[0], task_codes[0], 0)]}\nSubject To\n")
+    
+    # Core constraints
+    for p in PEOPLE:
+        for w in week_range:
+            write(f"one_{p}_{w}: " + " + ".join(xn[(p, t, w)] for t in task_codes) + " <= 1\n")
+    for t in task_codes:
+        for w in week_range:
+            write(f"two_{t}_{w}: " + " + ".join(xn[(p, t, w)] for p in PEOPLE) + " = 2\n")
+    
+    # Link people working together
+    for w in week_range:
+        for (p1, p2) in PAIRS:
+            y = yn[(p1, p2, w)]
+            for t in task_codes:
+                write(f"link_{p1}_{p2}_{t}_{w}: {y} - {xn[(p1, t, w)]} - {xn[(p2, t, w)]} >= -1\n")
+            for p in (p1, p2):
+                write(f"cap_{p1}_{p2}_{p}_{w}: {y} - " + " - ".join(xn[(p, t, w)] for t in task_codes) + " <= 0\n")
+    
+    # Perfect task rotation
+    task_block = len(task_codes)
+    for p in PEOPLE:
+        for block_start in range(0, weeks, task_block):
+            block_weeks = range(block_start, min(block_start + task_block, weeks))
+            for t in task_codes:
+                write(f"rot_{p}_{t}_{block_start}: " + " + ".join(xn[(p, t, w)] for w in block_weeks) + " = 1\n")
+    
+    # Fair partner distribution
+    block_size = len(PEOPLE) - 1
+    for block_start in range(0, weeks, block_size):
+        block_weeks = range(block_start, min(block_start + block_size, weeks))
+        for (p1, p2) in PAIRS:
+            together = " + ".join(yn[(p1, p2, w)] for w in block_weeks)
+            write(f"fair_lo_{p1}_{p2}_{block_start}: {together} >= 1\n")
+            write(f"fair_hi_{p1}_{p2}_{block_start}: {together} <= 2\n")
+    
+    # Symmetry breaking, as in add_symmetry_breaking
+    for t1, t2 in zip(task_codes[1:], task_codes[2:]):
+        terms = [f"+ {i} {xn[(p, t1, 0)]} - {i} {xn[(p, t2, 0)]}" for i, p in enumerate(PEOPLE) if i]
+        write(f"sym_{t1}_{t2}: " + " ".join(terms) + " <= 0\n")
+    
+    write(f"Bounds\n {xn[(PEOPLE[0], task_codes[0], 0)]} = 1\nBinaries\n")
+    for name in xn.values():
+        write(f"{name}\n")
+    for name in yn.values():
+        write(f"{name}\n")
+    
+    # One task per person per week as SOS1 sets
+    write("SOS\n")
+    for p in PEOPLE:
+        for w in week_range:
+            members = " ".join(f"{xn[(p, t, w)]}:{i + 1}" for i, t in enumerate(task_codes))
+            write(f"one_task_{p}_{w}: S1:: {members}\n")
+    write("End\n")
+    return out.getvalue()
+
+# Statuses cbc writes when it stops early; only followed by "- objective value" do they come with
+# an integer solution
+CBC_STOPPED_WITH_SOLUTION = ("Stopped on iterations", "Stopped on solutions", "Stopped on time")
+
+def solve_one_random(seed, task_codes, weeks, time_limit=30, threads=None):
+    """Solve one randomized attempt, returning (diff, schedule, (min, max, pair_counts)) or None"""
+    # Different solutions come from CBC's random seed, so the objective stays a dummy and
+    # CBC can stop at the first integer solution. The model is written as LP text and
+    # handed to the cbc binary directly.
+    print(f"Solving with {time_limit} second time limit...")
+    with tempfile.TemporaryDirectory() as tmp:
+        lp_path = os.path.join(tmp, "problem.lp")
+        solution_path = os.path.join(tmp, "solution.txt")
+        with open(lp_path, "w") as f:
+            f.write(_emit_lp(task_codes, weeks, seed))
+        cmd = [pulp.PULP_CBC_CMD().path, lp_path, "-sec", str(time_limit), "-randomSeed", str(seed),
+               "-ratioGap", "1", "-allowableGap", "1e9", "-maxSolutions", "1"]
+        if threads:
+            cmd += ["-threads", str(threads)]
+        cmd += ["-solve", "-solution", solution_path]
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            with open(solution_path) as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            lines = []
+    
+    # cbc reports "Stopped on iterations" when maxSolutions stops it, but with a dummy
+    # objective any integer solution it found is optimal. When the time limit runs out before
+    # one is found it still reports an objective value, for the continuous relaxation, and
+    # says "no integer solution" in the status, which must not be mistaken for a schedule
+    header = lines[0] if lines else ""
+    status = header.split(" - objective value")[0].strip() if lines else "Not Solved"
+    if status in CBC_STOPPED_WITH_SOLUTION and " - objective value" in header and "no integer solution" not in header:
+        status = "Optimal"
+    print(f"Solution status: {status}")
+    if status != 'Optimal':
+        print("No optimal solution found in this attempt.")
+        return None
+        
+    # Extract solution: "<index> <name> <value> <reduced cost>", keeping only chosen x variables
+    # Every (task, week) gets exactly two people, so the slots are created up front
+    pairs = {(t, w): [] for t in task_codes for w in range(weeks)}
+    for line in lines[1:]:
+        fields = line.split()
+        if fields[0] == "**":
+            fields = fields[1:]
+        name, value = fields[1], float(fields[2])
+        if name.startswith("x_") and value > 0.5:
+            _, p, t, w = name.split("_")
+            pairs[(t, int(w))].append(p)
+    if any(len(people) != 2 for people in pairs.values()):
+        print("The solution file does not give every task two people, ignoring this attempt.")
+        return None
+    schedule = [{t: tuple(sorted(pairs[(t, w)], key=PERSON_INDEX.get)) for t in task_codes}
+                for w in range(weeks)]
+        
+    # Check fairness
+    min_pair, max_pair, pair_counts = get_pairing_stats(schedule)
+    diff = max_pair - min_pair
+    print(f"Solution found with diff: {diff} (min: {min_pair}, max: {max_pair})")
+    return diff, schedule, (min_pair, max_pair, pair_counts)
+
+def run_captured(solve, *args, **kwargs):
+    """Run a solver (usually in a worker process) and return its result with everything it printed"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = solve(*args, **kwargs)
+    return result, buffer.getvalue()
 
 def solve_with_randomness(task_codes, weeks=18, num_iterations=5, time_limit=30):
-    """Try multiple solutions with randomness and pick the best one"""
+    """Try multiple solutions with randomness in parallel and pick the best one"""
     print(f"Generating {num_iterations} random solutions for {weeks} weeks...")
     
     best_schedule = None
     best_diff = None
     best_stats = None
     
-    for i in range(num_iterations):
-        print(f"\nRandom solution attempt {i+1}/{num_iterations}...")
-        
-        # Create problem with randomized weights to generate different solutions
-        x = pulp.LpVariable.dicts('x', (PEOPLE, task_codes, range(weeks)), 0, 1, pulp.LpBinary)
-        prob = pulp.LpProblem(f'TaskRotation_{i}', pulp.LpMinimize)
-        
-        # Random weights in the objective for variety
-        random_weights = {(p, t, w): random.uniform(0.01, 0.05) for p in PEOPLE for t in task_codes for w in range(weeks)}
-        prob += pulp.lpSum(random_weights[(p, t, w)] * x[p][t][w] for p in PEOPLE for t in task_codes for w in range(weeks))
-        
-        # Core constraints
-        for p in PEOPLE:
-            for w in range(weeks):
-                prob += pulp.lpSum(x[p][t][w] for t in task_codes) <= 1
-
-        for t in task_codes:
-            for w in range(weeks):
-                prob += pulp.lpSum(x[p][t][w] for p in PEOPLE) == 2
-
-        # Link people working together
-        y = pulp.LpVariable.dicts('y', (PEOPLE, PEOPLE, range(weeks)), 0, 1, pulp.LpBinary)
-        for w in range(weeks):
-            for t in task_codes:
-                for p1 in PEOPLE:
-                    for p2 in PEOPLE:
-                        if p1 >= p2:
-                            continue
-                        prob += y[p1][p2][w] >= x[p1][t][w] + x[p2][t][w] - 1
-            for p1 in PEOPLE:
-                for p2 in PEOPLE:
-                    if p1 >= p2:
-                        continue
-                    prob += y[p1][p2][w] <= pulp.lpSum(x[p1][t][w] for t in task_codes)
-                    prob += y[p1][p2][w] <= pulp.lpSum(x[p2][t][w] for t in task_codes)
-
-        # Perfect task rotation
-        task_block = len(task_codes)
-        for p in PEOPLE:
-            for block_start in range(0, weeks, task_block):
-                block_weeks = [w for w in range(block_start, min(block_start + task_block, weeks))]
-                for t in task_codes:
-                    prob += pulp.lpSum(x[p][t][w] for w in block_weeks) == 1
-
-        # Fair partner distribution
-        block_size = len(PEOPLE) - 1
-        for p1 in PEOPLE:
-            for block_start in range(0, weeks, block_size):
-                block_weeks = [w for w in range(block_start, min(block_start + block_size, weeks))]
-                for p2 in PEOPLE:
-                    if p1 == p2:
-                        continue
-                    prob += pulp.lpSum(y[min(p1,p2)][max(p1,p2)][w] for w in block_weeks) >= 1
-                    prob += pulp.lpSum(y[min(p1,p2)][max(p1,p2)][w] for w in block_weeks) <= 2
-        
-        # Solve and check the result
-        print(f"Solving with {time_limit} second time limit...")
-        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit)
-        prob.solve(solver)
-        status = pulp.LpStatus[prob.status]
-        print(f"Solution status: {status}")
-        
-        if status != 'Optimal':
-            print("No optimal solution found in this attempt.")
-            continue
-            
-        # Extract solution
-        schedule = []
-        for w in range(weeks):
-            week_assignments = {}
-            for t in task_codes:
-                assigned = [p for p in PEOPLE if pulp.value(x[p][t][w]) > 0.5]
-                if len(assigned) == 2:
-                    week_assignments[t] = tuple(assigned)
-            schedule.append(week_assignments)
+    # Split the cores between worker processes and CBC's own threads
+    workers = min(num_iterations, os.cpu_count() or 1)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_captured, solve_one_random, i + 1, task_codes, weeks, time_limit, threads)
+                   for i in range(num_iterations)]
+        for i, future in enumerate(futures):
+            result, output = future.result()
+            print(f"\nRandom solution attempt {i+1}/{num_iterations}...")
+            print(output, end="")
+            if result is None:
+                continue
+            diff, schedule, stats = result
             
-        # Check fairness
-        min_pair, max_pair, pair_counts = get_pairing_stats(schedule)
-        diff = max_pair - min_pair
-        print(f"Solution found with diff: {diff} (min: {min_pair}, max: {max_pair})")
-        
-        if best_diff is None or diff < best_diff:
-            best_diff = diff
-            best_schedule = schedule
-            best_stats = (min_pair, max_pair, pair_counts)
-            print(f"This is our new best solution so far! Diff: {diff}")
+            if best_diff is None or diff < best_diff:
+                best_diff = diff
+                best_schedule = schedule
+                best_stats = stats
+                print(f"This is our new best solution so far! Diff: {diff}")
             
     if best_schedule:
         print(f"\n✨ Best solution has diff = {best_diff} with min pairings = {best_stats[0]}, max pairings = {best_stats[1]}")
@@ -224,38 +543,75 @@ def print_schedule(schedule, task_codes):
                 print(f"  {task}: {pair[0]} ⟷ {pair[1]}")
         print("-" * 20)
         
-    # Print statistics
-    person_tasks = defaultdict(list)
-    person_partners = defaultdict(list)
+    # Print statistics, tallied in one pass into person x task and person x person counts
+    task_index = {t: i for i, t in enumerate(task_codes)}
+    task_counts = [[0] * len(task_codes) for _ in PEOPLE]
+    partner_counts = [[0] * len(PEOPLE) for _ in PEOPLE]
     for week in schedule:
-        for task, pair in week.items():
-            p1, p2 = pair
-            person_tasks[p1].append(task)
-            person_tasks[p2].append(task)
-            person_partners[p1].append(p2)
-            person_partners[p2].append(p1)
+        for task, (p1, p2) in week.items():
+            i1, i2 = PERSON_INDEX[p1], PERSON_INDEX[p2]
+            task_counts[i1][task_index[task]] += 1
+            task_counts[i2][task_index[task]] += 1
+            partner_counts[i1][i2] += 1
+            partner_counts[i2][i1] += 1
             
     print("\n📊 STATISTICS 📊")
     print("-" * 40)
     print("Task distribution:")
     for person in sorted(PEOPLE):
-        task_counts = {t: person_tasks[person].count(t) for t in task_codes}
-        print(f"  {person}: {task_counts}")
+        print(f"  {person}: {dict(zip(task_codes, task_counts[PERSON_INDEX[person]]))}")
         
     print("\nPartnership distribution:")
     for person in sorted(PEOPLE):
-        partner_counts = {p: person_partners[person].count(p) for p in PEOPLE if p != person}
-        print(f"  {person}: {partner_counts}")
+        row = partner_counts[PERSON_INDEX[person]]
+        partners = {p: row[i] for i, p in enumerate(PEOPLE) if p != person}
+        print(f"  {person}: {partners}")
 
 def save_to_json(schedule, filename):
     """Save the schedule to a JSON file"""
-    with open(filename, 'w') as f:
-        json.dump(schedule, f, indent=2)
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(schedule, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w') as f:
+            json.dump(schedule, f, indent=2)
     print(f"Schedule saved to {filename}")
 
-def hunt_for_solution(task_codes, min_weeks=10, max_weeks=30, max_allowed_diff=2):
-    """Try different week counts to find a solution"""
+def hunt_attempts(task_codes, week_counts, max_allowed_diff, legacy=False, use_cache=True):
+    """Yield (weeks, schedule or None) for every week count, in order"""
+    if legacy:
+        # CBC already uses every core for each solve, so the week counts run one by one
+        for weeks in week_counts:
+            print(f"\nTrying {weeks} weeks...")
+            yield weeks, solve_rotation_schedule(task_codes, weeks, max_allowed_diff=max_allowed_diff,
+                                                 use_cache=use_cache)
+        return
+
+    # The searches are independent, so run every week count at once and replay their output in order
+    pool = ProcessPoolExecutor(max_workers=min(len(week_counts), os.cpu_count() or 1))
+    try:
+        futures = [(weeks, pool.submit(run_captured, solve_with_backtracking, task_codes, weeks,
+                                       max_allowed_diff=max_allowed_diff, use_cache=use_cache))
+                   for weeks in week_counts]
+        for weeks, future in futures:
+            schedule, output = future.result()
+            print(f"\nTrying {weeks} weeks...")
+            print(output, end="")
+            yield weeks, schedule
+    finally:
+        # Drop the week counts that haven't started. The running ones are bounded by time_limit,
+        # so don't wait for them here
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def hunt_for_solution(task_codes, min_weeks=10, max_weeks=30, max_allowed_diff=2, legacy=False, use_cache=True):
+    """Try different week counts to find a solution (legacy=True uses the PuLP model)"""
     print(f"Hunting for a solution with {len(task_codes)} tasks...")
+    cached_at = cache_path("hunt", legacy, sorted(task_codes), min_weeks, max_weeks, max_allowed_diff)
+    cached = load_cached(cached_at) if use_cache else None
+    if cached is not None:
+        weeks, schedule = cached
+        print(f"Using the best solution cached in {cached_at}: weeks = {weeks}")
+        return weeks, schedule_from_json(schedule)
     print(f"Will try every week from {min_weeks} to {max_weeks}")
     
     best_schedule = None
@@ -263,9 +619,7 @@ def hunt_for_solution(task_codes, min_weeks=10, max_weeks=30, max_allowed_diff=2
     best_stats = None
     best_weeks = None
     
-    for weeks in range(min_weeks, max_weeks + 1):
-        print(f"\nTrying {weeks} weeks...")
-        schedule = solve_rotation_schedule(task_codes, weeks, max_allowed_diff=max_allowed_diff)
+    for weeks, schedule in hunt_attempts(task_codes, range(min_weeks, max_weeks + 1), max_allowed_diff, legacy, use_cache):
         if schedule:
             min_pair, max_pair, pair_counts = get_pairing_stats(schedule)
             diff = max_pair - min_pair
@@ -275,9 +629,14 @@ def hunt_for_solution(task_codes, min_weeks=10, max_weeks=30, max_allowed_diff=2
                 best_schedule = schedule
                 best_stats = (min_pair, max_pair, pair_counts)
                 best_weeks = weeks
+            if diff == 0:
+                print("Perfectly balanced solution found, stopping the hunt.")
+                break
                 
     if best_schedule:
         print(f"\nBest solution found: weeks = {best_weeks}, min pairings = {best_stats[0]}, max pairings = {best_stats[1]}, diff = {best_diff}")
+        if use_cache:
+            store_cached(cached_at, [best_weeks, best_schedule])
         return best_weeks, best_schedule
         
     print(f"❌ No fair solution found with max-min diff <= {max_allowed_diff} in the specified range")
@@ -305,6 +664,12 @@ if __name__ == "__main__":
                        help="Use randomized solver to find multiple solutions")
     parser.add_argument("--iterations", "-i", type=int, default=5,
                        help="Number of random iterations to try (default: 5)")
+    parser.add_argument("--legacy", action="store_true",
+                       help="Use the PuLP/CBC model instead of the backtracking search")
+    parser.add_argument("--fairest", action="store_true",
+                       help="Solve the PuLP model once, minimizing the max-min pairing diff")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Solve again even if a cached solution exists in .cache/")
     args = parser.parse_args()
     
     # Select tasks based on category
@@ -347,7 +712,12 @@ if __name__ == "__main__":
         else:
             print("❌ No solution found with randomized solver!")
     elif weeks:
-        schedule = solve_rotation_schedule(tasks, weeks, max_allowed_diff=max_allowed_diff)
+        if args.fairest:
+            schedule = solve_rotation_schedule(tasks, weeks, max_allowed_diff=max_allowed_diff,
+                                               use_cache=not args.no_cache, fairest=True)
+        else:
+            solve = solve_rotation_schedule if args.legacy else solve_with_backtracking
+            schedule = solve(tasks, weeks, max_allowed_diff=max_allowed_diff, use_cache=not args.no_cache)
         if schedule:
             min_pair, max_pair, _ = get_pairing_stats(schedule)
             diff = max_pair - min_pair
@@ -359,7 +729,8 @@ if __name__ == "__main__":
         else:
             print("❌ No solution found!")
     else:
-        weeks, schedule = hunt_for_solution(tasks, max_allowed_diff=max_allowed_diff)
+        weeks, schedule = hunt_for_solution(tasks, max_allowed_diff=max_allowed_diff, legacy=args.legacy,
+                                            use_cache=not args.no_cache)
         if schedule:
             print_schedule(schedule, tasks)
             save_to_json(schedule, f"{tasks[0].lower()}_rotation.json")
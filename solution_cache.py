@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""Cache of solved schedules, shared by simple_solver.py and tarefas.py"""
+import hashlib
+import json
+import os
+import sys
+
+CACHE_DIR = ".cache"
+
+def cache_path(*params):
+    """Path of the cache file for a set of solver parameters"""
+    key = hashlib.blake2b(repr(params).encode(), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{key}.json")
+
+def load_cached(path):
+    """Return the data cached at path, or None if there is nothing usable there"""
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def store_cached(path, data):
+    """Cache data at path for later runs"""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+def schedule_from_json(data):
+    """JSON turns the (p1, p2) pairs into lists, turn them back into tuples. The decoded task codes
+    and people are new string objects, so they are interned to match the constants they are
+    looked up against"""
+    intern = sys.intern
+    return [{intern(t): (intern(p1), intern(p2)) for t, (p1, p2) in week.items()} for week in data]
@@ -1,61 +1,90 @@
 #!/usr/bin/env python3
 import collections
+import functools
 from collections import defaultdict, Counter
 import random
-import time
 import sys
 import os
-from itertools import combinations
+from itertools import combinations, product
 from colorama import Fore, Style, init
 import pulp
-import contextlib
-import io
 import argparse
+import contextlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from tarefas_tasks import (
-    TASK_CODES, TASK_SYMBOLS, TASK_COLORS, TASK_DESCRIPTIONS,
     PEOPLE, PEOPLE_SYMBOLS, DEFAULT_DAYS, CATEGORIES,
     get_tasks_by_category, create_task_collections
 )
 # Import other things from tarefas_print
 from tarefas_print import load_schedule_json, export_schedule_to_html, export_schedule_to_pdf, get_output_path
+# Solved schedules share a cache directory with simple_solver.py
+from solution_cache import cache_path, load_cached, store_cached, schedule_from_json
 
 # ========== CONFIGURATION ==========
-init(autoreset=True)
+# Keep the colours when the output is a pipe that ends up on a terminal (TAREFAS_COLOR=1, set by run_all.py)
+init(autoreset=True, strip=False if os.environ.get('TAREFAS_COLOR') == '1' else None)
 
 # Use centralized values as default but they can be overridden
 DAYS = DEFAULT_DAYS
 PAIRS = list(combinations(PEOPLE, 2))
+# Skip the spinner animation (TAREFAS_FAST=1 or --fast)
+FAST_MODE = os.environ.get('TAREFAS_FAST') == '1'
+# Which MILP solver to use: "auto" (HiGHS when available, else CBC), "highs" or "cbc" (TAREFAS_SOLVER or --solver)
+SOLVER = os.environ.get('TAREFAS_SOLVER', 'auto')
+# The pairs each person is in, and the pair(s) two people share, for the constraint builders
+PAIRS_OF = {person: tuple(p for p in PAIRS if person in p) for person in PEOPLE}
+PAIRS_OF_BOTH = {(a, b): tuple(p for p in PAIRS if a in p and b in p)
+                 for a in PEOPLE for b in PEOPLE if a != b}
 
 # ========== OUTPUT HELPERS ==========
+# Colored strings are composed once and reused, instead of re-joining them per character on every call
+_TITLE_CACHE = {}
+SPINNER_FRAMES = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
+_RAINBOW = [Fore.RED, Fore.YELLOW, Fore.GREEN, Fore.BLUE, Fore.MAGENTA]
+RAINBOW_COMPLETION = ''.join(f"{_RAINBOW[i % 5]}{char}" for i, char in enumerate("✅ PERFECT FAIR ROTATION COMPLETE ✅"))
+RESET = Style.RESET_ALL
+WEEK_RULE = f"{Fore.YELLOW}{'-' * 30}{RESET}"
+SELF_CELL = f"{Fore.BLACK}{'X':<5}{RESET}"
+PERSON_NAME = {person: f"{Fore.RED}{person}{RESET} {PEOPLE_SYMBOLS[person]}" for person in PEOPLE}
+PERSON_ROW_LABEL = {person: f"  {Fore.RED}{Style.BRIGHT}{person}{RESET} {PEOPLE_SYMBOLS[person]} " for person in PEOPLE}
+
 def print_title(category=None):
-    category_text = CATEGORIES.get(category, "TAREFAS") if category else "PERFECT PAIRING ROTATION"
-    title = f"🔀 {category_text} 🔀"
-    colors = [Fore.RED, Fore.YELLOW, Fore.GREEN, Fore.CYAN, Fore.BLUE, Fore.MAGENTA]
-    colored_title = ''.join(f"{colors[i % len(colors)]}{char}" for i, char in enumerate(title))
+    colored_title = _TITLE_CACHE.get(category)
+    if colored_title is None:
+        category_text = CATEGORIES.get(category, "TAREFAS") if category else "PERFECT PAIRING ROTATION"
+        title = f"🔀 {category_text} 🔀"
+        colors = [Fore.RED, Fore.YELLOW, Fore.GREEN, Fore.CYAN, Fore.BLUE, Fore.MAGENTA]
+        colored_title = ''.join(f"{colors[i % len(colors)]}{char}" for i, char in enumerate(title))
+        _TITLE_CACHE[category] = colored_title
     print(f"\n{Style.BRIGHT}{colored_title}{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}{'=' * 50}{Style.RESET_ALL}")
 
-def animated_loading(message="Calculating", duration=1.5):
-    frames = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
-    end = time.time() + duration
-    i = 0
-    print()
-    while time.time() < end:
-        i = (i + 1) % len(frames)
-        print(f"\r{Fore.CYAN}{message} {frames[i]}", end='')
-        time.sleep(0.1)
-    print(f"\r{' ' * (len(message) + 10)}", end='\r')
-
-def progress_bar(iteration, total, prefix='', suffix='', length=50, fill='█', print_end="\r"):
-    percent = ("{0:.1f}").format(100 * (iteration / float(total)))
-    filled_length = int(length * iteration // total)
-    bar = fill * filled_length + '░' * (length - filled_length)
-    color = Fore.RED
-    if iteration / total > 0.3: color = Fore.YELLOW
-    if iteration / total > 0.7: color = Fore.GREEN
-    print(f'\r{prefix} {color}{bar}{Style.RESET_ALL} {percent}% {suffix}', end=print_end)
-    sys.stdout.flush()
-    if iteration == total: print()
+@contextlib.contextmanager
+def animated_loading(message="Calculating"):
+    """Show a spinner for as long as the body runs (e.g. a solve). Without a terminal, or in fast
+    mode, only the message is printed."""
+    if FAST_MODE or not sys.stdout.isatty():
+        print(f"{Fore.YELLOW}{message}...{Style.RESET_ALL}")
+        yield
+        return
+    frames = [f"\r{Fore.CYAN}{message} {frame}" for frame in SPINNER_FRAMES]
+    done = threading.Event()
+    
+    def spin():
+        i = 0
+        while not done.wait(0.1):
+            i = (i + 1) % len(frames)
+            print(frames[i], end='', flush=True)
+    
+    spinner = threading.Thread(target=spin, daemon=True)
+    spinner.start()
+    try:
+        yield
+    finally:
+        done.set()
+        spinner.join()
+        print(f"\r{' ' * (len(message) + 10)}\r{Fore.YELLOW}{message}...{Style.RESET_ALL}")
 
 def print_legend(task_codes, task_symbols, task_colors, task_descriptions):
     print(f"{Fore.WHITE}{Style.BRIGHT}Tasks Legend:{Style.RESET_ALL}")
@@ -70,65 +99,150 @@ def print_schedule(final_schedule, task_codes, task_symbols, task_colors, catego
     collections_data = create_task_collections(category)
     task_descriptions = collections_data['TASK_DESCRIPTIONS']
     print_legend(task_codes, task_symbols, task_colors, task_descriptions)
+    sorted_tasks = sorted(task_codes)
+    task_labels = [(task, f"  {task_colors[task]}{task} {task_symbols[task]}{RESET}: ") for task in sorted_tasks]
+    # Each week is joined into one string and written at once. The loop only touches local names.
+    week_title = f"{Fore.CYAN}{Style.BRIGHT}Semana "
+    week_end = f"\n{WEEK_RULE}\n"
+    person_name = PERSON_NAME
+    write = sys.stdout.write
     for week_num, day in enumerate(final_schedule, 1):
-        print(f"{Fore.CYAN}{Style.BRIGHT}Semana {week_num}:{Style.RESET_ALL}")
-        for task in sorted(task_codes):
+        lines = [f"{week_title}{week_num}:{RESET}"]
+        for task, label in task_labels:
             if task in day:
-                pair = day[task]
-                p1, p2 = pair
-                print(f"  {task_colors[task]}{task} {task_symbols[task]}{Style.RESET_ALL}: {Fore.RED}{p1}{Style.RESET_ALL} {PEOPLE_SYMBOLS[p1]} ⟷ {Fore.RED}{p2}{Style.RESET_ALL} {PEOPLE_SYMBOLS[p2]}")
-        print(f"{Fore.YELLOW}{'-' * 30}{Style.RESET_ALL}")
+                p1, p2 = day[task]
+                lines.append(f"{label}{person_name[p1]} ⟷ {person_name[p2]}")
+        write('\n'.join(lines) + week_end)
+
+def collect_stats(final_schedule):
+    """Count how often each person does each task and works with each partner"""
+    # Count each (task, pair) once per schedule, then fan the totals out to both people
+    assignments = Counter((task, tuple(pair)) for day in final_schedule for task, pair in day.items())
+    person_tasks = defaultdict(Counter)
+    person_partners = defaultdict(Counter)
+    for (task, (p1, p2)), n in assignments.items():
+        person_tasks[p1][task] += n
+        person_tasks[p2][task] += n
+        person_partners[p1][p2] += n
+        person_partners[p2][p1] += n
+    return person_tasks, person_partners
 
 def print_stats(person_tasks, person_partners, task_codes, task_colors, task_symbols, category="kitchen"):
     print(f"\n{Fore.YELLOW}{Style.BRIGHT}🔍 FAIRNESS VERIFICATION 🔍{Style.RESET_ALL}")
     print(f"{Fore.YELLOW}{'=' * 50}{Style.RESET_ALL}\n")
     print(f"{Fore.CYAN}{Style.BRIGHT}📊 Task Distribution:{Style.RESET_ALL}")
-    headers = ["Person"] + sorted(task_codes)
-    print(f"  {headers[0]:<6}", end="")
-    for header in headers[1:]:
-        print(f"{task_colors[header]}{header} {task_symbols[header]}  {Style.RESET_ALL}", end="")
-    print() ; print(f"  {'-' * 30}")
+    sorted_tasks = sorted(task_codes)
+    per_task = DAYS // len(task_codes)
+    # Each row is joined into one string and written at once. The loops only touch local names.
+    write = sys.stdout.write
+    reset = RESET
+    row_labels = PERSON_ROW_LABEL
+    task_cols = [(task, task_colors[task]) for task in sorted_tasks]
+    parts = [f"  {'Person':<6}"]
+    parts += [f"{color}{task} {task_symbols[task]}  {reset}" for task, color in task_cols]
+    write(''.join(parts) + f"\n  {'-' * 30}\n")
     for person in PEOPLE:
-        task_count = Counter(person_tasks[person])
-        symbol = PEOPLE_SYMBOLS[person]
-        print(f"  {Fore.RED}{Style.BRIGHT}{person}{Style.RESET_ALL} {symbol} ", end="")
-        for task in sorted(task_codes):
+        task_count = person_tasks[person]
+        parts = [row_labels[person]]
+        for task, color in task_cols:
             count = task_count.get(task, 0)
-            blocks = "■" * count + "□" * (DAYS//len(task_codes) - count)
-            print(f"{task_colors[task]}{blocks:<6}{Style.RESET_ALL}", end="")
-        print()
+            blocks = "■" * count + "□" * (per_task - count)
+            parts.append(f"{color}{blocks:<6}{reset}")
+        write(''.join(parts) + '\n')
     print()
     print(f"{Fore.CYAN}{Style.BRIGHT}🤝 Partnership Distribution:{Style.RESET_ALL}")
-    headers = ["Person"] + PEOPLE
-    print(f"  {headers[0]:<6}", end="")
-    for header in headers[1:]:
-        print(f"{Fore.RED}{header:<5}{Style.RESET_ALL}", end="")
-    print() ; print(f"  {'-' * 35}")
+    parts = [f"  {'Person':<6}"]
+    parts += [f"{Fore.RED}{person:<5}{reset}" for person in PEOPLE]
+    write(''.join(parts) + f"\n  {'-' * 35}\n")
+    self_cell = SELF_CELL
     for person in PEOPLE:
-        partner_count = Counter(person_partners[person])
-        symbol = PEOPLE_SYMBOLS[person]
-        print(f"  {Fore.RED}{Style.BRIGHT}{person}{Style.RESET_ALL} {symbol} ", end="")
+        partner_count = person_partners[person]
+        parts = [row_labels[person]]
         for partner in PEOPLE:
             if partner == person:
-                print(f"{Fore.BLACK}{'X':<5}{Style.RESET_ALL}", end="")
+                parts.append(self_cell)
             else:
-                count = partner_count.get(partner, 0)
-                print(f"{count:<5}", end="")
-        print()
+                parts.append(f"{partner_count.get(partner, 0):<5}")
+        write(''.join(parts) + '\n')
     print()
 
 def print_banner():
     print(f"\n{Fore.GREEN}{Style.BRIGHT}{'✨' * 25}{Style.RESET_ALL}")
-    completion_msg = "✅ PERFECT FAIR ROTATION COMPLETE ✅"
-    rainbow_completion = ""
-    for i, char in enumerate(completion_msg):
-        color = [Fore.RED, Fore.YELLOW, Fore.GREEN, Fore.BLUE, Fore.MAGENTA][i % 5]
-        rainbow_completion += f"{color}{char}"
-    print(f"{Style.BRIGHT}{rainbow_completion}{Style.RESET_ALL}")
+    print(f"{Style.BRIGHT}{RAINBOW_COMPLETION}{Style.RESET_ALL}")
     print(f"{Fore.GREEN}{Style.BRIGHT}{'✨' * 25}{Style.RESET_ALL}")
 
 # ========== MAIN LOGIC ==========
-def main(category=None):
+def make_variables(days, task_codes):
+    """Binary variables x[day, task, pair] in one flat dict. The short names are zero-padded so
+    they sort in creation order when PuLP writes the model."""
+    keys = product(range(days), task_codes, PAIRS)
+    return {k: pulp.LpVariable(f"x{i:05d}", 0, 1, pulp.LpBinary) for i, k in enumerate(keys)}
+
+def add_symmetry_breaking(prob, x, task_codes):
+    """People are interchangeable in every model, so fix one labeling: the first task on day 0
+    goes to the first pair. Any schedule can be relabeled to satisfy this."""
+    prob += x[0, task_codes[0], PAIRS[0]] == 1
+
+def new_assignment_model(days, task_codes):
+    """The part every model shares: the variables, a problem with a dummy objective, and the rows
+    that assign each task to exactly one pair per day (returned per day, so they can be changed)"""
+    # Create binary variables: x[day, task, pair] = 1 if pair does task on day
+    x = make_variables(days, task_codes)
+    prob = pulp.LpProblem('TaskRotation', pulp.LpMinimize)
+    prob += 0  # Dummy objective function
+    
+    # Each task must be assigned exactly once per day
+    day_rows = []
+    for d in range(days):
+        rows = [pulp.LpConstraint(pulp.LpAffineExpression((x[d, t, p], 1) for p in PAIRS),
+                                  sense=pulp.LpConstraintEQ, rhs=1)
+                for t in task_codes]
+        prob.extend(rows)
+        day_rows.append(rows)
+    return prob, x, day_rows
+
+def person_task_totals(x, days, task_codes):
+    """For every (person, task), the expression counting how often that person does the task.
+    Each variable belongs to the two people in its pair, so one pass over (day, pair) per task
+    hands its term to both of them."""
+    totals = {}
+    for t in task_codes:
+        terms = {person: [] for person in PEOPLE}
+        for d, p in product(range(days), PAIRS):
+            term = (x[d, t, p], 1)
+            terms[p[0]].append(term)
+            terms[p[1]].append(term)
+        for person in PEOPLE:
+            totals[person, t] = pulp.LpAffineExpression(terms[person])
+    return totals
+
+def _get_solver(time_limit=None):
+    """Use HiGHS in memory when highspy is installed, then a `highs` binary on the PATH, and
+    otherwise fall back to the CBC binary that ships with PuLP (which writes the model to a file
+    and starts a process for every solve). SOLVER = "cbc" goes straight to CBC."""
+    if SOLVER != 'cbc':
+        for highs in (pulp.HiGHS, pulp.HiGHS_CMD):
+            solver = highs(msg=False, timeLimit=time_limit)
+            if solver.available():
+                return solver
+    return pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit)
+
+def extract_schedule(x, days, task_codes):
+    """Read the chosen pair for each day and task straight from varValue, stopping at the
+    first one since the model assigns exactly one pair per (day, task)"""
+    final_schedule = []
+    for d in range(days):
+        day = {}
+        for t in task_codes:
+            for p in PAIRS:
+                value = x[d, t, p].varValue
+                if value is not None and value > 0.5:
+                    day[t] = p
+                    break
+        final_schedule.append(day)
+    return final_schedule
+
+def main(category=None, use_cache=True):
     # Get the appropriate task collections for the selected category
     collections = create_task_collections(category)
     task_codes = collections['TASK_CODES']
@@ -137,95 +251,93 @@ def main(category=None):
     task_descriptions = collections['TASK_DESCRIPTIONS']
     
     print(f"\n{Style.BRIGHT}{Fore.CYAN}Generating the mathematically perfect rotation...{Style.RESET_ALL}")
-    steps = 6
-    for i in range(steps+1):
-        progress_bar(i, steps, prefix=f"{Fore.CYAN}Progress:", suffix="Complete", length=30)
-        time.sleep(0.1)
-    animated_loading("Solving ILP for perfect balance", 1.5)
     print_title(category)
     print(f"\n{Fore.WHITE}This script creates a mathematically perfect fair rotation with just two simple constraints:")
     print(f"{Fore.WHITE}1. Perfect rotativity of pairs (everyone works with everyone equally)")
     print(f"{Fore.WHITE}2. Perfect rotativity of tasks (each person does each task equally){Style.RESET_ALL}\n")
 
-    # ILP variables
-    x = pulp.LpVariable.dicts('x', (range(DAYS), task_codes, PAIRS), 0, 1, pulp.LpBinary)
-    prob = pulp.LpProblem('TaskRotation', pulp.LpMinimize)
-    prob += 0  # Dummy objective function
+    # Reuse the schedule an earlier run found for the same tasks, people and days
+    cached_at = cache_path("tarefas-balance", sorted(task_codes), PEOPLE, DAYS)
+    cached = load_cached(cached_at) if use_cache else None
+    if cached is not None:
+        print(f"ILP status: Optimal (cached in {cached_at})")
+        final_schedule = schedule_from_json(cached)
+    else:
+        final_schedule = solve_balanced_schedule(DAYS, task_codes)
+        if final_schedule is None:
+            print(f"{Fore.RED}No perfect solution found!{Style.RESET_ALL}")
+            exit(1)
+        if use_cache:
+            store_cached(cached_at, final_schedule)
+    # Collect stats
+    person_tasks, person_partners = collect_stats(final_schedule)
+    print_schedule(final_schedule, task_codes, task_symbols, task_colors, category)
+    print_stats(person_tasks, person_partners, task_codes, task_colors, task_symbols, category)
+    print_banner()
     
-    # ESSENTIAL CONSTRAINT: Each task must be assigned exactly once per day
-    for d in range(DAYS):
-        for t in task_codes:
-            prob += pulp.lpSum(x[d][t][p] for p in PAIRS) == 1
+    # Save the result
+    from tarefas_print import save_schedule_json
+    save_schedule_json(final_schedule, category=category)
+    
+    return final_schedule
+
+def solve_balanced_schedule(days, task_codes):
+    """
+    The balance model main() uses: every pair works together, and every person does every task,
+    as close to equally often as the number of days allows. Prints the ILP status and returns
+    the schedule, or None if there is none.
+    """
+    # ILP variables, and the essential constraint: each task must be assigned exactly once per day
+    prob, x, _ = new_assignment_model(days, task_codes)
     
     # GOAL 1: PERFECT ROTATIVITY OF PAIRS
     # Each pair should work together approximately the same number of times
-    target_pair_count = DAYS * len(task_codes) // len(PAIRS)
+    target_pair_count = days * len(task_codes) // len(PAIRS)
     
     # Handle case when days*tasks isn't divisible evenly by number of pairs
-    if (DAYS * len(task_codes)) % len(PAIRS) == 0:
+    if (days * len(task_codes)) % len(PAIRS) == 0:
         # Perfect division possible
         for p in PAIRS:
-            prob += pulp.lpSum(x[d][t][p] for d in range(DAYS) for t in task_codes) == target_pair_count
+            prob += pulp.LpConstraint(pulp.LpAffineExpression((x[d, t, p], 1) for d in range(days) for t in task_codes),
+                                      sense=pulp.LpConstraintEQ, rhs=target_pair_count)
     else:
         # Allow a difference of at most 1 task per pair
         for p in PAIRS:
-            prob += pulp.lpSum(x[d][t][p] for d in range(DAYS) for t in task_codes) >= target_pair_count
-            prob += pulp.lpSum(x[d][t][p] for d in range(DAYS) for t in task_codes) <= target_pair_count + 1
+            pair_total = pulp.LpAffineExpression((x[d, t, p], 1) for d in range(days) for t in task_codes)
+            prob += pulp.LpConstraint(pair_total, sense=pulp.LpConstraintGE, rhs=target_pair_count)
+            prob += pulp.LpConstraint(pair_total, sense=pulp.LpConstraintLE, rhs=target_pair_count + 1)
 
     # GOAL 2: PERFECT ROTATIVITY OF TASKS FOR EACH PERSON
     # Each person should do each task approximately the same number of times
-    target_task_count = DAYS // len(task_codes)
+    target_task_count = days // len(task_codes)
+    
+    task_totals = person_task_totals(x, days, task_codes)
     
     # If we can divide days evenly by tasks
-    if DAYS % len(task_codes) == 0:
+    if days % len(task_codes) == 0:
         for person in PEOPLE:
             for t in task_codes:
-                prob += pulp.lpSum(x[d][t][p] for d in range(DAYS) for p in PAIRS if person in p) == target_task_count
+                prob += pulp.LpConstraint(task_totals[person, t], sense=pulp.LpConstraintEQ, rhs=target_task_count)
     else:
         # Allow difference of at most 1 for each person-task combo
         for person in PEOPLE:
             for t in task_codes:
-                prob += pulp.lpSum(x[d][t][p] for d in range(DAYS) for p in PAIRS if person in p) >= target_task_count
-                prob += pulp.lpSum(x[d][t][p] for d in range(DAYS) for p in PAIRS if person in p) <= target_task_count + 1
+                task_total = task_totals[person, t]
+                prob += pulp.LpConstraint(task_total, sense=pulp.LpConstraintGE, rhs=target_task_count)
+                prob += pulp.LpConstraint(task_total, sense=pulp.LpConstraintLE, rhs=target_task_count + 1)
+    
+    add_symmetry_breaking(prob, x, task_codes)
     
-    # Suppress solver output
-    print(f"{Fore.YELLOW}Solving ILP for perfect balance...{Style.RESET_ALL}")
-    with contextlib.redirect_stdout(io.StringIO()):
-        prob.solve(pulp.PULP_CBC_CMD(msg=False))
+    # The solver is built with msg=False, which keeps it quiet
+    with animated_loading("Solving ILP for perfect balance"):
+        prob.solve(_get_solver())
     
     print(f"ILP status: {pulp.LpStatus[prob.status]}")
     if pulp.LpStatus[prob.status] != 'Optimal':
-        print(f"{Fore.RED}No perfect solution found!{Style.RESET_ALL}")
-        exit(1)
-    final_schedule = []
-    for d in range(DAYS):
-        day = {}
-        for t in task_codes:
-            for p in PAIRS:
-                if pulp.value(x[d][t][p]) > 0.5:
-                    day[t] = p
-        final_schedule.append(day)
-    # Collect stats
-    person_tasks = defaultdict(list)
-    person_partners = defaultdict(list)
-    for day in final_schedule:
-        for task, pair in day.items():
-            p1, p2 = pair
-            person_tasks[p1].append(task)
-            person_tasks[p2].append(task)
-            person_partners[p1].append(p2)
-            person_partners[p2].append(p1)
-    print_schedule(final_schedule, task_codes, task_symbols, task_colors, category)
-    print_stats(person_tasks, person_partners, task_codes, task_colors, task_symbols, category)
-    print_banner()
-    
-    # Save the result
-    from tarefas_print import save_schedule_json
-    save_schedule_json(final_schedule, category=category)
-    
-    return final_schedule
+        return None
+    return extract_schedule(x, days, task_codes)
 
-def solve_and_return_schedule(days, category=None, time_limit_seconds=10):
+def solve_and_return_schedule(days, category=None, time_limit_seconds=10, use_cache=True):
     """
     Completely rewritten solver with correct rotation constraints:
     1. If A works with C, A must work with everyone else before working with C again (perfect pair rotation)
@@ -234,23 +346,48 @@ def solve_and_return_schedule(days, category=None, time_limit_seconds=10):
     # Get the appropriate task collections for the selected category
     collections = create_task_collections(category)
     task_codes = collections['TASK_CODES']
-    
-    # Create binary variables: x[day][task][pair] = 1 if pair does task on day
-    x = pulp.LpVariable.dicts('x', (range(days), task_codes, PAIRS), 0, 1, pulp.LpBinary)
-    
-    # Create an optimization problem
-    prob = pulp.LpProblem('TaskRotation', pulp.LpMinimize)
-    prob += 0  # Dummy objective function
-    
+    if not rotation_can_fit(days, task_codes):
+        return None
+    cached = load_cached(rotation_cache_path(days, task_codes)) if use_cache else None
+    if cached is not None:
+        return schedule_from_json(cached)
+    model = build_rotation_model(days, task_codes)
+    return solve_rotation_model(model, days, time_limit_seconds, use_cache)
+
+def rotation_can_fit(days, task_codes):
+    """
+    Cheap necessary check for the perfect rotation model. Every task needs its own pair each week
+    and nobody does two tasks in a week, so more than len(PEOPLE) // 2 tasks can never be covered.
+    The fairness rows only ask for minimums, so the number of days itself rules nothing out.
+    """
+    return days > 0 and 2 * len(task_codes) <= len(PEOPLE)
+
+def rotation_cache_path(days, task_codes):
+    """Cache file for a perfect rotation schedule. The key holds the task codes and the people,
+    so editing either in tarefas_tasks.py stops the old schedules from being used."""
+    return cache_path("tarefas-rotation", sorted(task_codes), PEOPLE, days)
+
+def build_rotation_model(days, task_codes):
+    """
+    Build the perfect rotation model for up to `days` days. The rows whose right-hand side depends
+    on the number of days are kept in the returned dict, so solve_rotation_model can reuse the same
+    model for any shorter schedule.
+    """
     # CONSTRAINT 1: Each task must be assigned exactly once per day
-    for d in range(days):
-        for t in task_codes:
-            prob += pulp.lpSum(x[d][t][p] for p in PAIRS) == 1
+    prob, x, day_rows = new_assignment_model(days, task_codes)
+    
+    # The rotation rows are collected and added in one go, since prob += registers the variables
+    # of every row with the problem one by one (PuLP collects them again when it writes the model)
+    rows = []
+    # The constructors are bound to locals, since the loops below create thousands of rows
+    LpConstraint, LpAffineExpression = pulp.LpConstraint, pulp.LpAffineExpression
+    LE, GE = pulp.LpConstraintLE, pulp.LpConstraintGE
     
     # CONSTRAINT 2: No person does more than one task per week
     for d in range(days):
         for person in PEOPLE:
-            prob += pulp.lpSum(x[d][t][p] for t in task_codes for p in PAIRS if person in p) <= 1
+            rows.append(LpConstraint(LpAffineExpression((x[d, t, p], 1) for t in task_codes for p in PAIRS_OF[person]),
+                                     sense=LE, rhs=1))
     
     # CONSTRAINT 3: PERFECT ROTATION OF TASKS FOR EACH PERSON
     # If person does task T, they must do all other tasks before doing T again
@@ -262,55 +399,111 @@ def solve_and_return_schedule(days, category=None, time_limit_seconds=10):
                 
                 # Person can't do same task twice in this window
                 for t in task_codes:
-                    prob += pulp.lpSum(x[d][t][p] for d in window for p in PAIRS if person in p) <= 1
+                    rows.append(LpConstraint(LpAffineExpression((x[d, t, p], 1) for d in window for p in PAIRS_OF[person]),
+                                             sense=LE, rhs=1))
     
     # CONSTRAINT 4: PERFECT ROTATION OF PAIRS FOR EACH PERSON
-    # If person works with partner P, they must work with all other people before working with P again
+    # If person works with partner P, they must work with all other people before working with P again.
+    # The row for (person, partner) is the same as the one for (partner, person), so only the
+    # partners after person in PEOPLE get one.
     if len(PEOPLE) > 2:  # Only if we have more than 2 people
-        for person in PEOPLE:
-            # Get all partners this person can work with
-            partners = [p for p in PEOPLE if p != person]
-            for start_day in range(days - (len(partners) - 1)):
-                # In any window of len(partners) consecutive days where this person works
-                window = range(start_day, start_day + len(partners))
+        # Everyone can work with all the other people
+        n_partners = len(PEOPLE) - 1
+        for i, person in enumerate(PEOPLE):
+            for start_day in range(days - (n_partners - 1)):
+                # In any window of n_partners consecutive days where this person works
+                window = range(start_day, start_day + n_partners)
                 
                 # Person can't work with same partner twice in this window
-                for partner in partners:
+                for partner in PEOPLE[i + 1:]:
                     # Sum of all times person works with partner in window must be <= 1
-                    prob += pulp.lpSum(x[d][t][p] for d in window for t in task_codes 
-                                     for p in PAIRS if person in p and partner in p) <= 1
+                    rows.append(LpConstraint(LpAffineExpression((x[d, t, p], 1) for d in window for t in task_codes
+                                                                for p in PAIRS_OF_BOTH[person, partner]),
+                                             sense=LE, rhs=1))
+    prob.extend(rows)
     
     # Add fairness constraints - each person should do each task approximately the same number of times
     min_tasks_per_person = days // (len(PEOPLE) * 2)  # Minimum number each person should do each task
+    task_totals = person_task_totals(x, days, task_codes)
+    task_rows = []
     for person in PEOPLE:
         for t in task_codes:
-            prob += pulp.lpSum(x[d][t][p] for d in range(days) for p in PAIRS if person in p) >= min_tasks_per_person
+            task_rows.append(LpConstraint(task_totals[person, t], sense=GE, rhs=min_tasks_per_person))
+    prob.extend(task_rows)
     
     # Each pair should work together at least a minimum number of times
     min_pair_count = days // (len(PAIRS) * 2)  # Each pair should work together minimum number of times
+    pair_rows = []
     for p in PAIRS:
-        prob += pulp.lpSum(x[d][t][p] for d in range(days) for t in task_codes) >= min_pair_count
+        pair_rows.append(LpConstraint(LpAffineExpression((x[d, t, p], 1) for d in range(days) for t in task_codes),
+                                      sense=GE, rhs=min_pair_count))
+    prob.extend(pair_rows)
+    
+    add_symmetry_breaking(prob, x, task_codes)
+    
+    return {'prob': prob, 'x': x, 'task_codes': task_codes, 'days': days, 'day_rows': day_rows,
+            'task_rows': task_rows, 'pair_rows': pair_rows}
+
+def solve_rotation_model(model, days, time_limit_seconds=10, use_cache=True):
+    """
+    Solve a model from build_rotation_model for its first `days` days. Later days are switched off
+    by fixing their variables to 0 and dropping their assignment rows to 0, and the fairness minimums
+    are set for `days`. The rotation windows that run past the end then only involve days before it,
+    which the earlier full windows already cover. Schedules that are found are cached unless
+    use_cache is False.
+    """
+    task_codes = model['task_codes']
+    if not rotation_can_fit(days, task_codes):
+        return None
+    cached_at = rotation_cache_path(days, task_codes)
+    cached = load_cached(cached_at) if use_cache else None
+    if cached is not None:
+        return schedule_from_json(cached)
+    # That cover needs at least one full window of each kind before the end. With fewer days than
+    # the longest window, a model built for `days` has no rows for that kind at all, while the cut
+    # windows of the longer model would still forbid repeats across all `days`, so build one
+    if days < model['days'] and days < max(len(task_codes), len(PEOPLE) - 1):
+        model = build_rotation_model(days, task_codes)
+    prob, x = model['prob'], model['x']
+    for d, rows in enumerate(model['day_rows']):
+        active = 1 if d < days else 0
+        for t in task_codes:
+            for p in PAIRS:
+                x[d, t, p].upBound = active
+        for row in rows:
+            row.changeRHS(active)
+    for row in model['task_rows']:
+        row.changeRHS(days // (len(PEOPLE) * 2))
+    for row in model['pair_rows']:
+        row.changeRHS(days // (len(PAIRS) * 2))
     
     # Try to solve with time limit
-    with contextlib.redirect_stdout(io.StringIO()):
-        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit_seconds)
-        prob.solve(solver)
+    prob.solve(_get_solver(time_limit_seconds))
     
     if pulp.LpStatus[prob.status] != 'Optimal':
         return None
     
     # Extract solution
-    final_schedule = []
-    for d in range(days):
-        day = {}
-        for t in task_codes:
-            for p in PAIRS:
-                if pulp.value(x[d][t][p]) > 0.5:
-                    day[t] = p
-        final_schedule.append(day)
-    return final_schedule
+    schedule = extract_schedule(x, days, task_codes)
+    if use_cache:
+        store_cached(cached_at, schedule)
+    return schedule
+
+@functools.lru_cache(maxsize=1)
+def _hunt_model(days, task_codes):
+    """The rotation model a hunt worker restricts for each day count it gets, built once per worker"""
+    return build_rotation_model(days, list(task_codes))
+
+def solve_hunt_attempt(days, max_days, task_codes, use_cache=True):
+    """Worker side of hunt_for_solution: solve `days` on this worker's model for max_days days"""
+    if not rotation_can_fit(days, task_codes):
+        return None
+    cached = load_cached(rotation_cache_path(days, task_codes)) if use_cache else None
+    if cached is not None:
+        return schedule_from_json(cached)
+    return solve_rotation_model(_hunt_model(max_days, tuple(task_codes)), days, use_cache=use_cache)
 
-def hunt_for_solution(category=None, max_attempts=10, min_days=10, max_days=30):
+def hunt_for_solution(category=None, max_attempts=10, min_days=10, max_days=30, use_cache=True):
     """Try different configurations of days until a solution is found"""
     print(f"{Fore.CYAN}Hunting for a solution (max {max_attempts} attempts)...{Style.RESET_ALL}")
     collections = create_task_collections(category)
@@ -335,13 +528,31 @@ def hunt_for_solution(category=None, max_attempts=10, min_days=10, max_days=30):
     
     print(f"{Fore.YELLOW}Will try these day counts: {candidates}{Style.RESET_ALL}")
     
-    for i, days in enumerate(candidates, 1):
-        print(f"{Fore.CYAN}Attempt {i}/{len(candidates)}: Trying {days} days...{Style.RESET_ALL}", end="", flush=True)
-        schedule = solve_and_return_schedule(days, category=category)
-        if schedule:
-            print(f"{Fore.GREEN} ✓ Found solution!{Style.RESET_ALL}")
-            return days, schedule
-        print(f"{Fore.RED} ✗ No solution.{Style.RESET_ALL}")
+    # With cores to spare, probe every candidate at once in worker processes and read the results
+    # in order, so the smallest day count that works still wins. Either way the model is built once
+    # for the longest candidate (once per worker) and restricted for each attempt.
+    workers = min(len(candidates), os.cpu_count() or 1)
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        attempts = [pool.submit(solve_hunt_attempt, days, max(candidates), task_codes, use_cache=use_cache).result
+                    for days in candidates]
+    else:
+        model = build_rotation_model(max(candidates), task_codes)
+        attempts = [functools.partial(solve_rotation_model, model, days, use_cache=use_cache) for days in candidates]
+    try:
+        for i, (days, attempt) in enumerate(zip(candidates, attempts), 1):
+            print(f"{Fore.CYAN}Attempt {i}/{len(candidates)}: Trying {days} days...{Style.RESET_ALL}", end="", flush=True)
+            schedule = attempt()
+            if schedule:
+                print(f"{Fore.GREEN} ✓ Found solution!{Style.RESET_ALL}")
+                return days, schedule
+            print(f"{Fore.RED} ✗ No solution.{Style.RESET_ALL}")
+    finally:
+        if pool is not None:
+            # Drop the candidates that haven't started. The running ones are bounded by the solver's
+            # time limit, so don't wait for them here
+            pool.shutdown(wait=False, cancel_futures=True)
     
     # If all else fails, try with a relaxed constraints variant
     print(f"{Fore.YELLOW}No solution found with strict constraints. Trying relaxed variant...{Style.RESET_ALL}")
@@ -362,22 +573,14 @@ def solve_relaxed_schedule(days, category=None, time_limit_seconds=15):
     collections = create_task_collections(category)
     task_codes = collections['TASK_CODES']
     
-    # Create binary variables: x[day][task][pair] = 1 if pair does task on day
-    x = pulp.LpVariable.dicts('x', (range(days), task_codes, PAIRS), 0, 1, pulp.LpBinary)
-    
-    # Create an optimization problem
-    prob = pulp.LpProblem('TaskRotation', pulp.LpMinimize)
-    prob += 0  # Dummy objective function
-    
     # CONSTRAINT 1: Each task must be assigned exactly once per day
-    for d in range(days):
-        for t in task_codes:
-            prob += pulp.lpSum(x[d][t][p] for p in PAIRS) == 1
+    prob, x, _ = new_assignment_model(days, task_codes)
     
     # CONSTRAINT 2: No person does more than one task per week
     for d in range(days):
         for person in PEOPLE:
-            prob += pulp.lpSum(x[d][t][p] for t in task_codes for p in PAIRS if person in p) <= 1
+            prob += pulp.LpConstraint(pulp.LpAffineExpression((x[d, t, p], 1) for t in task_codes for p in PAIRS_OF[person]),
+                                      sense=pulp.LpConstraintLE, rhs=1)
     
     # CONSTRAINT 3: RELAXED ROTATION OF TASKS
     # Instead of perfect rotation, just prevent immediate repeats
@@ -385,49 +588,43 @@ def solve_relaxed_schedule(days, category=None, time_limit_seconds=15):
         for d in range(days - 1):
             for t in task_codes:
                 # Person can't do same task on consecutive days
-                prob += pulp.lpSum(x[d][t][p] for p in PAIRS if person in p) + \
-                       pulp.lpSum(x[d+1][t][p] for p in PAIRS if person in p) <= 1
+                prob += pulp.LpConstraint(pulp.LpAffineExpression((x[day, t, p], 1) for day in (d, d + 1)
+                                                                  for p in PAIRS_OF[person]),
+                                          sense=pulp.LpConstraintLE, rhs=1)
     
     # CONSTRAINT 4: RELAXED ROTATION OF PAIRS
-    # Instead of perfect rotation, just prevent immediate repeats of partnerships
-    for person in PEOPLE:
-        for partner in PEOPLE:
-            if person != partner:
-                for d in range(days - 1):
-                    # Person can't work with same partner on consecutive days
-                    prob += pulp.lpSum(x[d][t][p] for t in task_codes for p in PAIRS if person in p and partner in p) + \
-                           pulp.lpSum(x[d+1][t][p] for t in task_codes for p in PAIRS if person in p and partner in p) <= 1
+    # Instead of perfect rotation, just prevent immediate repeats of partnerships.
+    # Two people share exactly one pair, so there is one row per pair (not one per person and partner)
+    for p in PAIRS:
+        for d in range(days - 1):
+            # The pair can't work together on consecutive days
+            prob += pulp.LpConstraint(pulp.LpAffineExpression((x[day, t, p], 1) for day in (d, d + 1) for t in task_codes),
+                                      sense=pulp.LpConstraintLE, rhs=1)
     
     # FAIRNESS CONSTRAINT: Prevent any one person from doing too many tasks
     # Maximum percentage of tasks any person can do
     max_percent_tasks = 0.3  # No person can do more than 30% of all tasks
     total_tasks = days * len(task_codes)
+    person_total = {person: pulp.LpAffineExpression((x[d, t, p], 1) for d in range(days) for t in task_codes
+                                                    for p in PAIRS_OF[person])
+                    for person in PEOPLE}
     for person in PEOPLE:
-        prob += pulp.lpSum(x[d][t][p] for d in range(days) for t in task_codes for p in PAIRS if person in p) <= \
-                total_tasks * max_percent_tasks
+        prob += pulp.LpConstraint(person_total[person], sense=pulp.LpConstraintLE, rhs=total_tasks * max_percent_tasks)
     
     # Minimum tasks constraint - everyone should do at least one task
     for person in PEOPLE:
-        prob += pulp.lpSum(x[d][t][p] for d in range(days) for t in task_codes for p in PAIRS if person in p) >= 1
+        prob += pulp.LpConstraint(person_total[person], sense=pulp.LpConstraintGE, rhs=1)
+    
+    add_symmetry_breaking(prob, x, task_codes)
     
     # Try to solve with time limit
-    with contextlib.redirect_stdout(io.StringIO()):
-        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit_seconds)
-        prob.solve(solver)
+    prob.solve(_get_solver(time_limit_seconds))
     
     if pulp.LpStatus[prob.status] != 'Optimal':
         return None
     
     # Extract solution
-    final_schedule = []
-    for d in range(days):
-        day = {}
-        for t in task_codes:
-            for p in PAIRS:
-                if pulp.value(x[d][t][p]) > 0.5:
-                    day[t] = p
-        final_schedule.append(day)
-    return final_schedule
+    return extract_schedule(x, days, task_codes)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Task rotation scheduler")
@@ -438,8 +635,22 @@ if __name__ == "__main__":
     parser.add_argument('--start-date', type=str, help='Starting date in DD/MM/YYYY format (default: 05/05/2024)')
     parser.add_argument('--category', '-c', type=str, choices=list(CATEGORIES.keys()), default="kitchen",
                        help=f'Task category to generate schedule for (default: kitchen)')
+    parser.add_argument('--no-open', action='store_true', help="Don't open the exported HTML in a browser")
+    parser.add_argument('--fast', action='store_true', help='Skip the spinner animation')
+    parser.add_argument('--solver', choices=['auto', 'highs', 'cbc'], default=SOLVER,
+                        help='MILP solver (default: auto, HiGHS when installed and CBC otherwise)')
+    parser.add_argument('--no-cache', action='store_true', help='Solve again instead of reusing cached schedules')
     args = parser.parse_args()
     
+    if args.fast:
+        FAST_MODE = True
+        os.environ['TAREFAS_FAST'] = '1'
+    # Also exported, so the worker processes of hunt_for_solution pick the same solver
+    SOLVER = args.solver
+    os.environ['TAREFAS_SOLVER'] = SOLVER
+    if SOLVER == 'highs' and isinstance(_get_solver(), pulp.PULP_CBC_CMD):
+        print(f"{Fore.YELLOW}HiGHS is not installed (pip install highspy), using CBC instead.{Style.RESET_ALL}")
+    
     # Custom start date
     start_date = None
     if args.start_date:
@@ -478,11 +689,11 @@ if __name__ == "__main__":
         if args.pdf:
             export_schedule_to_pdf(schedule, start_date=start_date, category=category)
         else:
-            export_schedule_to_html(schedule, start_date=start_date, category=category)
+            export_schedule_to_html(schedule, start_date=start_date, category=category, open_browser=not args.no_open)
         exit(0)
     elif args.auto_days:
         print(f"{Fore.CYAN}Using smart solution hunting to find a valid schedule...{Style.RESET_ALL}")
-        days, final_schedule = hunt_for_solution(category=category)
+        days, final_schedule = hunt_for_solution(category=category, use_cache=not args.no_cache)
         
         if final_schedule:
             DAYS = days
@@ -494,32 +705,21 @@ if __name__ == "__main__":
             task_symbols = collections_data['TASK_SYMBOLS']
             task_colors = collections_data['TASK_COLORS']
             
-            person_tasks = defaultdict(list)
-            person_partners = defaultdict(list)
-            for day in final_schedule:
-                for task, pair in day.items():
-                    p1, p2 = pair
-                    person_tasks[p1].append(task)
-                    person_tasks[p2].append(task)
-                    person_partners[p1].append(p2)
-                    person_partners[p2].append(p1)
-                print_schedule(final_schedule, task_codes, task_symbols, task_colors, category)
-                print_stats(person_tasks, person_partners, task_codes, task_colors, task_symbols, category)
+            person_tasks, person_partners = collect_stats(final_schedule)
+            print_schedule(final_schedule, task_codes, task_symbols, task_colors, category)
+            print_stats(person_tasks, person_partners, task_codes, task_colors, task_symbols, category)
             print_banner()
             from tarefas_print import save_schedule_json
             save_schedule_json(final_schedule, category=category)
             if args.pdf:
                 from tarefas_print import export_schedule_to_pdf
                 export_schedule_to_pdf(final_schedule, start_date=start_date, category=category)
-            else:
-                print(f"{Fore.RED}Could not find any valid solution. Try with fewer people or tasks.{Style.RESET_ALL}")
-                exit(1)
         else:
-            print(f"{Fore.RED}Failed to find any solution after {max_attempts} attempts.{Style.RESET_ALL}")
+            print(f"{Fore.RED}Could not find any valid solution. Try with fewer people or tasks.{Style.RESET_ALL}")
             exit(1)
     else:
         # Run normal flow
-        final_schedule = main(category=category)
+        final_schedule = main(category=category, use_cache=not args.no_cache)
         if args.pdf:
             from tarefas_print import export_schedule_to_pdf
             export_schedule_to_pdf(final_schedule, start_date=start_date, category=category) 
\ No newline at end of file
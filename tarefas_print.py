@@ -1,22 +1,20 @@
 #!/usr/bin/env python3
 """Module for exporting schedules to HTML/PDF formats"""
 
+import functools
 import json
 import webbrowser
 import os
-import locale
+import sys
 from datetime import datetime, timedelta
 
-# Try to use Portuguese locale if available
+# orjson is optional, it only makes reading and writing the schedule files faster
 try:
-    locale.setlocale(locale.LC_TIME, 'pt_PT.UTF-8')
-except:
-    try:
-        locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-    except:
-        print("Warning: Could not set Portuguese locale. Dates will be in English.")
+    import orjson
+except ImportError:
+    orjson = None
 
-# Month and day translations for Portuguese
+# Month and day translations for Portuguese, so dates never depend on the system locale
 MONTH_NAMES = {
     1: 'Jan', 2: 'Fev', 3: 'Mar', 4: 'Abr', 
     5: 'Mai', 6: 'Jun', 7: 'Jul', 8: 'Ago',
@@ -28,46 +26,13 @@ WEEKDAY_NAMES = {
     4: 'Sex', 5: 'Sáb', 6: 'Dom'
 }
 
-def get_output_path(filename, category="kitchen"):
-    """Get the full path for an output file in the category directory"""
-    # Create output/category directory if it doesn't exist
-    output_dir = f"output/{category}"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    # Return full path
-    return os.path.join(output_dir, filename)
-
-def format_date_pt(date):
-    """Format date in Portuguese: '05 Mai (Dom)'"""
-    day = date.day
-    month = MONTH_NAMES[date.month]
-    weekday = WEEKDAY_NAMES[date.weekday()]
-    return f"{day:02d} {month} ({weekday})"
-
-def format_week_range_pt(start_date):
-    """Format a week range in Portuguese: '20 Mai a 26 Mai'"""
-    end_date = start_date + timedelta(days=6)
-    start_day = start_date.day
-    start_month = MONTH_NAMES[start_date.month]
-    end_day = end_date.day
-    end_month = MONTH_NAMES[end_date.month]
-    if start_month == end_month:
-        return f"{start_day:02d} a {end_day:02d} {end_month}"
-    else:
-        return f"{start_day:02d} {start_month} a {end_day:02d} {end_month}"
-
-def generate_html_content(final_schedule, task_codes, task_symbols, task_descriptions, 
-                         task_short_descriptions, task_css_colors, category_title, 
-                         start_date, people_symbols):
-    """Generate the HTML content for the schedule"""
-    # Get uppercase title
-    upper_title = category_title.upper()
-    
-    html_content = f"""<!DOCTYPE html>
+# Static parts of the page. The head template has the title filled in with str.format, so its
+# CSS braces are doubled
+HTML_HEAD_TEMPLATE = """<!DOCTYPE html>
 <html>
 <head>
     <meta charset=\"UTF-8\">
-    <title>{category_title}</title>
+    <title>{title}</title>
     <style>
         body {{
             font-family: 'Helvetica', 'Arial', sans-serif;
@@ -115,18 +80,8 @@ def generate_html_content(final_schedule, task_codes, task_symbols, task_descrip
             font-size: 1.1em;
         }}
 """
-    # Generate specific styles for each task's CSS class
-    for code in task_codes:
-        short_desc = task_short_descriptions[code].lower()
-        color = task_css_colors.get(code, '#333333')
-        html_content += f"""        .task-{short_desc} {{ 
-            color: {color}; 
-            font-weight: bold; 
-        }}
-"""
-    
-    # Continue with the rest of the CSS
-    html_content += """        .schedule {
+
+SCHEDULE_CSS = """        .schedule {
             width: 100%;
             border-collapse: collapse;
             margin: 15px 0;
@@ -206,56 +161,141 @@ def generate_html_content(final_schedule, task_codes, task_symbols, task_descrip
                 break-inside: avoid;
             }
         }
-    </style>
+"""
+
+HTML_BODY_TEMPLATE = """    </style>
 </head>
 <body>
-    <h1>🔀 """ + upper_title + """ 🔀</h1>
+    <h1>🔀 {title} 🔀</h1>
     <table class=\"legend\">
         <tr>
             <th>Tarefa</th>
             <th>Descrição</th>
         </tr>
 """
+
+# Templates for the schedule table rows
+ROW_TEMPLATE = '        <tr{page_break}>\n            <td class="day-col">{date}</td>\n{cells}        </tr>\n'
+CELL_FILLED = '            <td>{} ⟷ {}</td>\n'
+CELL_EMPTY = '            <td></td>\n'
+
+def can_open_browser():
+    """False in CI, and on Linux/BSD when there is no display to open a browser on"""
+    if os.environ.get('CI'):
+        return False
+    if os.name == 'posix' and sys.platform != 'darwin':
+        return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+    return True
+
+# Output directories already created by this process
+_CREATED_DIRS = set()
+
+def get_output_path(filename, category="kitchen"):
+    """Get the full path for an output file in the category directory"""
+    # Create output/category directory if it doesn't exist, once per process
+    output_dir = f"output/{category}"
+    if output_dir not in _CREATED_DIRS:
+        os.makedirs(output_dir, exist_ok=True)
+        _CREATED_DIRS.add(output_dir)
+    
+    # Return full path
+    return os.path.join(output_dir, filename)
+
+def format_date_pt(date):
+    """Format date in Portuguese: '05 Mai (Dom)'"""
+    day = date.day
+    month = MONTH_NAMES[date.month]
+    weekday = WEEKDAY_NAMES[date.weekday()]
+    return f"{day:02d} {month} ({weekday})"
+
+@functools.lru_cache(maxsize=512)
+def format_week_range_pt(start_date):
+    """Format a week range in Portuguese: '20 Mai a 26 Mai'"""
+    end_date = start_date + timedelta(days=6)
+    start_day = start_date.day
+    start_month = MONTH_NAMES[start_date.month]
+    end_day = end_date.day
+    end_month = MONTH_NAMES[end_date.month]
+    if start_month == end_month:
+        return f"{start_day:02d} a {end_day:02d} {end_month}"
+    else:
+        return f"{start_day:02d} {start_month} a {end_day:02d} {end_month}"
+
+def task_fragments(task_codes, task_symbols, task_descriptions, task_short_descriptions, task_css_colors):
+    """The parts of the page that only depend on the tasks: their CSS rules, their legend rows and
+    their schedule header cells"""
+    # CSS class of each task, used in all three parts
+    task_classes = {code: f"task-{task_short_descriptions[code].lower()}" for code in task_codes}
+    # Generate specific styles for each task's CSS class
+    style_rules = "".join(f"""        .{task_classes[code]} {{ 
+            color: {task_css_colors.get(code, '#333333')}; 
+            font-weight: bold; 
+        }}
+""" for code in task_codes)
     # Include emoji directly with task name
-    for i, code in enumerate(task_codes):
-        short_desc = task_short_descriptions[code].lower()
-        task_class = f"task-{short_desc}"
-        html_content += f"""
+    legend_rows = "".join(f"""
         <tr>
-            <td><span class="{task_class} task-title"><span class="task-emoji">{task_symbols[code]}</span>{task_short_descriptions[code]}</span></td>
+            <td><span class="{task_classes[code]} task-title"><span class="task-emoji">{task_symbols[code]}</span>{task_short_descriptions[code]}</span></td>
             <td>{task_descriptions[code]}</td>
-        </tr>"""
-    html_content += """
+        </tr>""" for code in task_codes)
+    # Use white text with background color in table headers for better contrast
+    header_cells = "".join(f'            <th><span class="task-header">{task_symbols[code]} {task_short_descriptions[code]}</span></th>\n'
+                           for code in task_codes)
+    return style_rules, legend_rows, header_cells
+
+@functools.lru_cache(maxsize=None)
+def category_fragments(category):
+    """task_fragments() for a category's tasks. Task definitions don't change while running, so
+    each category is only rendered once"""
+    from tarefas_tasks import create_task_collections
+    collections = create_task_collections(category)
+    return task_fragments(collections['TASK_CODES'], collections['TASK_SYMBOLS'], collections['TASK_DESCRIPTIONS'],
+                          collections['TASK_SHORT_DESCRIPTIONS'], collections['TASK_CSS_COLORS'])
+
+def iter_html_content(final_schedule, task_codes, task_symbols, task_descriptions,
+                      task_short_descriptions, task_css_colors, category_title,
+                      start_date, people_symbols, fragments=None):
+    """Generate the HTML content for the schedule piece by piece, so it can be written to a file
+    as it is produced. `fragments` can hold task_fragments() for these tasks, computed beforehand"""
+    # Get uppercase title
+    upper_title = category_title.upper()
+    if fragments is None:
+        fragments = task_fragments(task_codes, task_symbols, task_descriptions,
+                                   task_short_descriptions, task_css_colors)
+    style_rules, legend_rows, header_cells = fragments
+    # The "name symbol" label of each person
+    person_labels = {person: f"{person} {symbol}" for person, symbol in people_symbols.items()}
+    
+    yield HTML_HEAD_TEMPLATE.format(title=category_title)
+    yield style_rules
+    # Continue with the rest of the CSS and the start of the page
+    yield SCHEDULE_CSS
+    yield HTML_BODY_TEMPLATE.format(title=upper_title)
+    yield legend_rows
+    yield """
     </table>
     <table class=\"schedule\">
         <tr>
             <th>Semana</th>
 """
-    # Use white text with background color in table headers for better contrast
-    for code in task_codes:
-        short_desc = task_short_descriptions[code]
-        html_content += f'            <th><span class="task-header">{task_symbols[code]} {short_desc}</span></th>\n'
-    html_content += "        </tr>\n"
+    yield header_cells
+    yield "        </tr>\n"
     
-    # Generate actual calendar dates with Portuguese month names
-    for week_num, day in enumerate(final_schedule, 0):
-        current_date = start_date + timedelta(weeks=week_num)
-        date_str = format_week_range_pt(current_date)
-        
-        # Add page break after week 10, 20, 30, etc.
-        page_break_class = ' class="page-break"' if (week_num + 1) % 10 == 0 else ''
-        
-        html_content += f"        <tr{page_break_class}>\n            <td class=\"day-col\">{date_str}</td>\n"
-        for code in task_codes:
-            if code in day:
-                p1, p2 = day[code]
-                html_content += f'            <td>{p1} {people_symbols[p1]} ⟷ {p2} {people_symbols[p2]}</td>\n'
-            else:
-                html_content += '            <td></td>\n'
-        html_content += "        </tr>\n"
+    # Generate actual calendar dates with Portuguese month names, one pass over the weeks up front
+    one_week = timedelta(weeks=1)
+    date_strs = [format_week_range_pt(start_date + week_num * one_week) for week_num in range(len(final_schedule))]
+    # Add page break after week 10, 20, 30, etc.
+    page_break_classes = ['' if (week_num + 1) % 10 else ' class="page-break"' for week_num in range(len(final_schedule))]
+    
+    # Every cell a pair can fill is formatted once, then each row is filled from one template
+    pair_cells = {(p1, p2): CELL_FILLED.format(person_labels[p1], person_labels[p2])
+                  for p1 in person_labels for p2 in person_labels if p1 != p2}
+    for day, date_str, page_break_class in zip(final_schedule, date_strs, page_break_classes):
+        cells = "".join(pair_cells[tuple(pair)] if pair else CELL_EMPTY for pair in map(day.get, task_codes))
+        yield ROW_TEMPLATE.format(page_break=page_break_class, date=date_str, cells=cells)
     
     # Close the table properly
-    html_content += """    </table>
+    yield """    </table>
     
     <div class=\"footer\">
         <p>Feito por Afonso ❤️</p>
@@ -264,26 +304,20 @@ def generate_html_content(final_schedule, task_codes, task_symbols, task_descrip
 </body>
 </html>
 """
-    return html_content
 
-def export_schedule_to_html(final_schedule, filename=None, start_date=None, category="kitchen"):
-    """
-    Export the schedule to a beautiful HTML file that's ready to print.
-    
-    Parameters:
-    - final_schedule: The schedule data
-    - filename: Output HTML filename
-    - start_date: Starting date (default: May 20, 2024)
-    - category: Schedule category
-    """
+def generate_html_content(final_schedule, task_codes, task_symbols, task_descriptions, 
+                         task_short_descriptions, task_css_colors, category_title, 
+                         start_date, people_symbols):
+    """Generate the HTML content for the schedule"""
+    return "".join(iter_html_content(final_schedule, task_codes, task_symbols, task_descriptions,
+                                     task_short_descriptions, task_css_colors, category_title,
+                                     start_date, people_symbols))
+
+def iter_category_html(final_schedule, start_date=None, category="kitchen"):
+    """iter_html_content() for one of the categories in tarefas_tasks"""
     # Import task-related data
     from tarefas_tasks import (create_task_collections, PEOPLE_SYMBOLS, CATEGORIES)
     
-    # Set appropriate output path if none provided
-    if filename is None:
-        filename = f"{category}_rotation.html"
-        filename = get_output_path(filename, category)
-        
     # Get category-specific task collections for proper rendering
     collections = create_task_collections(category)
     task_codes = collections['TASK_CODES']
@@ -299,24 +333,46 @@ def export_schedule_to_html(final_schedule, filename=None, start_date=None, cate
     # Get category title
     category_title = CATEGORIES.get(category, "TAREFAS")
     
-    # Generate HTML content
-    html_content = generate_html_content(
+    return iter_html_content(
         final_schedule, task_codes, task_symbols, task_descriptions,
         task_short_descriptions, task_css_colors, category_title, 
-        start_date, PEOPLE_SYMBOLS
+        start_date, PEOPLE_SYMBOLS, category_fragments(category)
     )
+
+def open_in_browser(path, open_browser=True):
+    """Show an exported file, unless told not to or there is nowhere to show it"""
+    if open_browser and can_open_browser():
+        print(f"Opening {path} in browser.")
+        webbrowser.open('file://' + os.path.realpath(path))
+
+def export_schedule_to_html(final_schedule, filename=None, start_date=None, category="kitchen", open_browser=True):
+    """
+    Export the schedule to a beautiful HTML file that's ready to print.
     
-    # Write HTML file
+    Parameters:
+    - final_schedule: The schedule data
+    - filename: Output HTML filename
+    - start_date: Starting date (default: May 20, 2024)
+    - category: Schedule category
+    - open_browser: Open the file in a browser (skipped anyway when there is nowhere to show it)
+    """
+    # Set appropriate output path if none provided
+    if filename is None:
+        filename = f"{category}_rotation.html"
+        filename = get_output_path(filename, category)
+    
+    # Generate the HTML content straight into the file
     with open(filename, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+        f.writelines(iter_category_html(final_schedule, start_date, category))
     print(f"HTML exported to {filename}")
-    print(f"Opening {filename} in browser.")
-    webbrowser.open('file://' + os.path.realpath(filename))
+    open_in_browser(filename, open_browser)
     return filename
 
-def export_schedule_to_pdf(final_schedule, filename=None, start_date=None, category="kitchen"):
+def export_schedule_to_pdf(final_schedule, filename=None, start_date=None, category="kitchen", open_browser=False):
     """
-    For PDF export, we'll first create an HTML file and, if possible, convert it to PDF using WeasyPrint.
+    Export the schedule to PDF with WeasyPrint, rendering the HTML in memory. Without WeasyPrint the
+    HTML file is exported instead, to be printed from a browser. Nothing is opened unless
+    open_browser is True, so batch exports don't start a viewer per file.
     """
     # Default filename based on category
     if filename is None:
@@ -325,25 +381,38 @@ def export_schedule_to_pdf(final_schedule, filename=None, start_date=None, categ
     # Get full path for output file
     output_path = get_output_path(filename, category)
     
-    # HTML file has same name with .html extension
-    html_filename = os.path.basename(filename).replace('.pdf', '.html')
-    
-    # Export to HTML first
-    html_path = export_schedule_to_html(
-        final_schedule, 
-        filename=get_output_path(html_filename, category), 
-        start_date=start_date, 
-        category=category
-    )
-    
     try:
         from weasyprint import HTML
-        HTML(html_path).write_pdf(output_path)
-        print(f"PDF exported to {output_path}")
     except ImportError:
+        # HTML file has same name with .html extension
+        html_filename = os.path.basename(filename).replace('.pdf', '.html')
+        html_path = export_schedule_to_html(
+            final_schedule, 
+            filename=get_output_path(html_filename, category), 
+            start_date=start_date, 
+            category=category,
+            open_browser=open_browser
+        )
         print("[WARNING] WeasyPrint not installed! HTML version generated only.")
         print("For perfect PDF, install with: pip install weasyprint && sudo apt install libpango-1.0-0 libpangocairo-1.0-0 libcairo2")
-        print("HTML opened in browser. Use Ctrl+P to print or save as PDF.")
+        print(f"Open {html_path} in a browser and use Ctrl+P to print or save as PDF.")
+        return
+    
+    HTML(string="".join(iter_category_html(final_schedule, start_date, category))).write_pdf(output_path)
+    print(f"PDF exported to {output_path}")
+    open_in_browser(output_path, open_browser)
+
+def _dump_json(data):
+    """Encode data as indented UTF-8 JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _read_json(filename):
+    """Read a JSON file, with orjson when it is installed"""
+    with open(filename, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
 
 def save_schedule_json(final_schedule, filename=None, category="kitchen"):
     """Save the schedule to a JSON file for later reuse"""
@@ -359,8 +428,10 @@ def save_schedule_json(final_schedule, filename=None, category="kitchen"):
         'schedule': final_schedule
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # json.dump writes every small token to the file on its own, so encode the whole document
+    # once and write it in one go
+    with open(output_path, 'wb') as f:
+        f.write(_dump_json(data))
     print(f"Schedule saved to {output_path}")
 
 def load_schedule_json(filename=None, category="kitchen"):
@@ -369,8 +440,7 @@ def load_schedule_json(filename=None, category="kitchen"):
         filename = f"{category}_rotation.json"
         
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _read_json(filename)
             
         # Handle both new and old format
         if isinstance(data, dict) and 'schedule' in data:
@@ -381,8 +451,7 @@ def load_schedule_json(filename=None, category="kitchen"):
     except FileNotFoundError:
         # Check if there's an old-style file in the root directory
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(filename)
             print(f"Using old file {filename} in project root (will migrate to new location)")
             
             # Save it to the new location for future use
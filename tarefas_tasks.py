@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Task definitions module for rotation scheduler"""
+import functools
 from colorama import Fore
 
 # People definitions
@@ -32,6 +33,8 @@ CATEGORIES = {
 
 # Task class definition
 class Task:
+    __slots__ = ('code', 'symbol', 'color', 'description', 'short_desc', 'category')
+    
     def __init__(self, code, symbol, color, description, short_desc=None, category="kitchen"):
         self.code = code
         self.symbol = symbol
@@ -57,6 +60,9 @@ TASKS = [
     Task('G2', '🧹', Fore.GREEN, 'Limpar a caixa de areia durante toda a semana', 'Limpar', category="cats"),
 ]
 
+# Tasks by code, so lookups don't scan TASKS
+_TASK_BY_CODE = {task.code: task for task in TASKS}
+
 # CSS colors for HTML output
 TASK_CSS_COLORS = {
     'K1': '#0a7d36',  # darker green
@@ -75,27 +81,29 @@ LEGACY_CODE_MAP = {'C1': 'K1', 'C2': 'K2'}
 # Default days
 DEFAULT_DAYS = 15
 
+@functools.lru_cache(maxsize=None)
 def get_tasks_by_category(category=None):
-    """Get all tasks in a specific category, or all tasks if category is None"""
+    """Get all tasks in a specific category, or all tasks if category is None.
+    The result is cached, so it is a tuple"""
     if category is None:
-        return TASKS
-    return [task for task in TASKS if task.category == category]
+        return tuple(TASKS)
+    return tuple(task for task in TASKS if task.category == category)
 
 def get_task_by_code(code):
     """Get a task object by its code, with backward compatibility for old codes"""
-    if code in LEGACY_CODE_MAP:
-        code = LEGACY_CODE_MAP[code]
-        
-    for task in TASKS:
-        if task.code == code:
-            return task
-    raise ValueError(f"Task code {code} not found!")
+    code = LEGACY_CODE_MAP.get(code, code)
+    task = _TASK_BY_CODE.get(code)
+    if task is None:
+        raise ValueError(f"Task code {code} not found!")
+    return task
 
+@functools.lru_cache(maxsize=None)
 def create_task_collections(category=None):
-    """Create helper collections for task attributes by category"""
+    """Create helper collections for task attributes by category. The result is cached and shared
+    between callers, so TASK_CODES is a tuple and the dicts must not be changed"""
     tasks = get_tasks_by_category(category)
     return {
-        'TASK_CODES': [t.code for t in tasks],
+        'TASK_CODES': tuple(t.code for t in tasks),
         'TASK_SYMBOLS': {t.code: t.symbol for t in tasks},
         'TASK_COLORS': {t.code: t.color for t in tasks},
         'TASK_DESCRIPTIONS': {t.code: t.description for t in tasks},
@@ -103,10 +111,14 @@ def create_task_collections(category=None):
         'TASK_CSS_COLORS': TASK_CSS_COLORS
     }
 
-# Default kitchen task collections for backward compatibility
-collections = create_task_collections("kitchen")
-TASK_CODES = collections['TASK_CODES']
-TASK_SYMBOLS = collections['TASK_SYMBOLS']
-TASK_COLORS = collections['TASK_COLORS']
-TASK_DESCRIPTIONS = collections['TASK_DESCRIPTIONS']
-TASK_SHORT_DESCRIPTIONS = collections['TASK_SHORT_DESCRIPTIONS'] 
\ No newline at end of file
+# Default kitchen task collections for backward compatibility. They are built on first access
+# (PEP 562), so importing the module for one category doesn't build the kitchen ones up front
+_DEFAULT_COLLECTION_NAMES = ('TASK_CODES', 'TASK_SYMBOLS', 'TASK_COLORS', 'TASK_DESCRIPTIONS',
+                             'TASK_SHORT_DESCRIPTIONS')
+
+def __getattr__(name):
+    if name == 'collections':
+        return create_task_collections("kitchen")
+    if name in _DEFAULT_COLLECTION_NAMES:
+        return create_task_collections("kitchen")[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
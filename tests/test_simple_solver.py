@@ -0,0 +1,32 @@
+import unittest
+
+from simple_solver import PAIRS, get_pairing_stats
+
+
+class GetPairingStatsTest(unittest.TestCase):
+    def test_counts_every_meeting(self):
+        schedule = [{'L': ('A', 'C'), 'S': ('M', 'P')}, {'L': ('A', 'C'), 'S': ('D', 'H')}]
+        _, max_pair, pair_counts = get_pairing_stats(schedule)
+        self.assertEqual(max_pair, 2)
+        self.assertEqual(pair_counts[('A', 'C')], 2)
+        self.assertEqual(pair_counts[('M', 'P')], 1)
+        self.assertEqual(pair_counts[('D', 'H')], 1)
+
+    def test_pairs_that_never_meet_count_as_zero(self):
+        min_pair, max_pair, pair_counts = get_pairing_stats([{'L': ('A', 'C')}])
+        self.assertEqual((min_pair, max_pair), (0, 1))
+        self.assertEqual(set(pair_counts), set(PAIRS))
+        self.assertEqual(sum(pair_counts.values()), 1)
+
+    def test_pair_order_does_not_matter(self):
+        _, _, pair_counts = get_pairing_stats([{'L': ('C', 'A')}, {'L': ('A', 'C')}])
+        self.assertEqual(pair_counts[('A', 'C')], 2)
+
+    def test_empty_schedule(self):
+        min_pair, max_pair, pair_counts = get_pairing_stats([])
+        self.assertEqual((min_pair, max_pair), (0, 0))
+        self.assertEqual(len(pair_counts), len(PAIRS))
+
+
+if __name__ == '__main__':
+    unittest.main()
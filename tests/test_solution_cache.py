@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import solution_cache
+from solution_cache import cache_path, load_cached, schedule_from_json, store_cached
+
+
+class SolutionCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = mock.patch.object(solution_cache, 'CACHE_DIR', os.path.join(tmp.name, '.cache'))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        schedule = [{'L': ('A', 'C'), 'S': ('M', 'P')}, {'L': ('D', 'H'), 'S': ('A', 'M')}]
+        path = cache_path("test", ['L', 'S'], 2, None)
+        store_cached(path, schedule)
+        self.assertEqual(schedule_from_json(load_cached(path)), schedule)
+
+    def test_pairs_come_back_as_interned_tuples(self):
+        schedule = schedule_from_json([{'L': ['A', 'C']}])
+        pair = schedule[0]['L']
+        self.assertIsInstance(pair, tuple)
+        self.assertIs(pair[0], 'A')
+        self.assertIs(next(iter(schedule[0])), 'L')
+
+    def test_key_depends_on_every_parameter(self):
+        self.assertEqual(cache_path("pulp", ['L'], 10), cache_path("pulp", ['L'], 10))
+        self.assertNotEqual(cache_path("pulp", ['L'], 10), cache_path("pulp", ['L'], 11))
+        self.assertNotEqual(cache_path("pulp", ['L'], 10), cache_path("backtracking", ['L'], 10))
+
+    def test_missing_or_corrupt_file(self):
+        path = cache_path("test", "missing")
+        self.assertIsNone(load_cached(path))
+        os.makedirs(solution_cache.CACHE_DIR)
+        with open(path, 'w') as f:
+            f.write('{"truncated": ')
+        self.assertIsNone(load_cached(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
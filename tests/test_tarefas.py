@@ -0,0 +1,53 @@
+import hashlib
+import random
+import unittest
+from datetime import datetime
+from itertools import combinations
+
+import tarefas
+import tarefas_print
+from tarefas_tasks import CATEGORIES, PEOPLE, PEOPLE_SYMBOLS, create_task_collections
+
+
+class RotationCanFitTest(unittest.TestCase):
+    def test_tasks_that_fit(self):
+        task_codes = create_task_collections('kitchen')['TASK_CODES']
+        self.assertTrue(tarefas.rotation_can_fit(1, task_codes))
+        self.assertTrue(tarefas.rotation_can_fit(30, task_codes))
+
+    def test_no_days(self):
+        self.assertFalse(tarefas.rotation_can_fit(0, ['L']))
+
+    def test_more_tasks_than_pairs_per_week(self):
+        task_codes = [f"T{i}" for i in range(len(PEOPLE) // 2 + 1)]
+        self.assertFalse(tarefas.rotation_can_fit(30, task_codes))
+
+
+class GenerateHtmlContentTest(unittest.TestCase):
+    # Length and md5 of the page the original generator rendered for the schedules below
+    EXPECTED = {
+        'kitchen': (11934, 'e7930444ac16890514ca73302e9131e1'),
+        'cats': (10307, '3a7650c9b0e7201efbe945c52bdd1bb1'),
+    }
+
+    def render(self, category):
+        c = create_task_collections(category)
+        random.seed(3)
+        pairs = list(combinations(PEOPLE, 2))
+        # Some days leave a task out, to cover the empty cells too
+        schedule = [{t: random.choice(pairs) for t in c['TASK_CODES'] if random.random() < 0.9} for _ in range(40)]
+        return tarefas_print.generate_html_content(schedule, c['TASK_CODES'], c['TASK_SYMBOLS'],
+                                                   c['TASK_DESCRIPTIONS'], c['TASK_SHORT_DESCRIPTIONS'],
+                                                   c['TASK_CSS_COLORS'], CATEGORIES[category],
+                                                   datetime(2024, 5, 20), PEOPLE_SYMBOLS)
+
+    def test_matches_original_output(self):
+        for category, (length, digest) in self.EXPECTED.items():
+            with self.subTest(category=category):
+                html = self.render(category)
+                self.assertEqual(len(html), length)
+                self.assertEqual(hashlib.md5(html.encode()).hexdigest(), digest)
+
+
+if __name__ == '__main__':
+    unittest.main()